@@ -1,10 +1,9 @@
-import re
 import json
 import asyncio
 import logging
 import os
 import anthropic
-from typing import Dict, List, Any, Callable, Optional, Tuple, Union
+from typing import Dict, List, Any, Callable, Optional, Union
 import shlex
 import traceback
 from dotenv import load_dotenv
@@ -144,79 +143,6 @@ class AnthropicLLMClient(BaseLLMClient):
         """The prefix string that indicates a tool call in the LLM's output."""
         return self._tool_call_prefix
     
-    def parse_tool_call(self, response: str) -> Optional[Tuple[str, str, Dict[str, Any]]]:
-        """
-        Parse the LLM's response text to find an Anthropic-style tool call instruction.
-        Expected format: TOOL_CALL: server=X tool=Y param1="value1" param2=123 ...
-        """
-        # Look for the TOOL_CALL pattern
-        tool_call_match = re.search(rf"^{re.escape(self.tool_call_prefix)}\s*(.*?)$", response, re.MULTILINE)
-        
-        if not tool_call_match:
-            logger.debug("No TOOL_CALL prefix detected in response")
-            return None
-            
-        tool_call_line = tool_call_match.group(1).strip()
-        logger.debug(f"Found potential tool call line: {tool_call_line}")
-        
-        # Extract server and tool names
-        server_match = re.search(r'server\s*=\s*([^\s]+)', tool_call_line)
-        tool_match = re.search(r'tool\s*=\s*([^\s]+)', tool_call_line)
-        
-        if not server_match or not tool_match:
-            logger.warning(f"Invalid TOOL_CALL format (missing server or tool): {tool_call_line}")
-            return None
-            
-        server_name = server_match.group(1)
-        tool_name = tool_match.group(1)
-        logger.debug(f"Extracted server='{server_name}', tool='{tool_name}'")
-        
-        # Extract parameters - handle quoted values carefully
-        params = {}
-        # Regex to find key=value pairs, handling quotes correctly
-        param_pattern = r'(\b\w+\b)\s*=\s*(?:"((?:\\"|[^"\\])*)"|([^\s"]+))'
-        
-        for match in re.finditer(param_pattern, tool_call_line):
-            param_name = match.group(1)
-            
-            # Skip server and tool parameters themselves
-            if param_name in ('server', 'tool'):
-                continue
-                
-            # group(2) is the content inside quotes, group(3) is the unquoted value
-            if match.group(2) is not None:
-                # Value was quoted
-                param_value_str = match.group(2).replace('\\"', '"')
-            else:
-                # Value was not quoted
-                param_value_str = match.group(3)
-                
-            # Attempt to interpret the value
-            try:
-                # Try JSON decoding first for complex types
-                param_value = json.loads(param_value_str)
-            except json.JSONDecodeError:
-                # If JSON fails, apply simple type conversion heuristics
-                if param_value_str.lower() == 'true':
-                    param_value = True
-                elif param_value_str.lower() == 'false':
-                    param_value = False
-                elif param_value_str.isdigit():
-                    param_value = int(param_value_str)
-                elif param_value_str.replace('.', '', 1).isdigit() and param_value_str.count('.') <= 1:
-                    try:
-                        param_value = float(param_value_str)
-                    except ValueError:
-                        param_value = param_value_str
-                else:
-                    # Keep as string
-                    param_value = param_value_str
-                    
-            params[param_name] = param_value
-            logger.debug(f"Extracted param: {param_name}={param_value} (type: {type(param_value)})")
-            
-        return server_name, tool_name, params
-    
     def get_default_tool_instructions(self) -> str:
         """
         Provide specific instructions for how Claude should format tool calls.
@@ -17,7 +17,7 @@ package_dir = os.path.abspath(os.path.join(current_dir, '..', '..'))
 if package_dir not in sys.path:
     sys.path.insert(0, package_dir)
 
-from pymcp_sse.client import MultiMCPClient
+from pymcp_sse.client import MultiMCPClient, install_fast_loop
 from pymcp_sse.utils import get_logger, configure_logging
 from pymcp_sse.common.constants import NOTIFICATION_INFO, NOTIFICATION_WARNING, NOTIFICATION_ERROR, NOTIFICATION_DATA
 
@@ -244,6 +244,7 @@ async def main():
         await app.close()
 
 if __name__ == "__main__":
+    install_fast_loop() # Use uvloop/uringcore if installed
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
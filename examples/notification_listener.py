@@ -23,7 +23,7 @@ package_dir = os.path.abspath(os.path.join(current_dir, '..'))
 if package_dir not in sys.path:
     sys.path.insert(0, package_dir)
 
-from pymcp_sse.client import BaseMCPClient
+from pymcp_sse.client import BaseMCPClient, install_fast_loop
 from pymcp_sse.common.constants import (
     NOTIFICATION_INFO, 
     NOTIFICATION_WARNING, 
@@ -58,8 +58,8 @@ class NotificationListener:
             http_connect_timeout=10
         )
         
-        # Register notification handler
-        self.client.notification_handler = self.handle_notification
+        # Register notification callback
+        self.client.add_notification_callback(self.on_notification)
         
     async def connect(self):
         """Connect to the MCP server."""
@@ -98,6 +98,20 @@ class NotificationListener:
             logger.error(f"Error subscribing to updates: {e}")
             return None
     
+    async def on_notification(self, params):
+        """
+        Notification callback registered with the client.
+        
+        Args:
+            params: Notification parameters (type, message, data, timestamp)
+        """
+        await self.handle_notification(
+            params.get("type"),
+            params.get("message"),
+            params.get("data"),
+            params.get("timestamp")
+        )
+        
     async def handle_notification(self, type_name, message, data=None, timestamp=None):
         """
         Handle notifications from the server.
@@ -168,8 +182,8 @@ class NotificationListener:
         except Exception as e:
             logger.error(f"Error in notification listener: {e}")
         finally:
-            # Clean up
-            await self.client.close()
+            # Clean up (close the connection and release the HTTP clients)
+            await self.client.shutdown()
 
 async def main():
     """Main entry point."""
@@ -184,4 +198,5 @@ async def main():
     await listener.run()
 
 if __name__ == "__main__":
+    install_fast_loop() # Use uvloop/uringcore if installed
     asyncio.run(main()) 
\ No newline at end of file
@@ -1,7 +1,6 @@
 import os
 import sys
 import asyncio
-import argparse
 import random
 from datetime import datetime
 
@@ -19,7 +18,8 @@ log_level = os.environ.get("LOG_LEVEL", "INFO").upper()
 configure_logging(level=log_level)
 logger = get_logger("example.server_basic")
 
-# Create server instance
+# Create server instance (module-level so uvicorn can import it directly,
+# e.g. `uvicorn examples.server_basic.main:server.app --workers 4`)
 server = BaseMCPServer(server_name="Basic Example Server")
 
 # --- Tools --- 
@@ -50,7 +50,10 @@ async def get_simulated_weather(location: str) -> dict:
 
 # --- Main Execution --- 
 
-if __name__ == "__main__":
+def _cli():
+    """Parse command-line arguments and run the server."""
+    import argparse
+
     parser = argparse.ArgumentParser(description="Run the Basic Example MCP Server.")
     parser.add_argument(
         "--host",
@@ -75,4 +78,7 @@ if __name__ == "__main__":
         )
     except Exception as e:
         logger.critical(f"Server failed to run: {e}", exc_info=True)
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1)
+
+if __name__ == "__main__":
+    _cli()
@@ -1,7 +1,6 @@
 import os
 import sys
 import asyncio
-import argparse
 import random
 from datetime import datetime
 from typing import Optional
@@ -20,7 +19,7 @@ from pymcp_sse.server import (
     NOTIFICATION_ERROR,
     NOTIFICATION_DATA
 )
-from pymcp_sse.utils import configure_logging, get_logger
+from pymcp_sse.utils import configure_logging, get_logger, install_fast_loop
 
 # Configure logging
 log_level = os.environ.get("LOG_LEVEL", "INFO").upper()
@@ -95,7 +94,7 @@ async def stop_scheduler_tasks(): # Renamed for clarity
     """Gracefully shuts down all tasks managed by the scheduler."""
     logger.info("Executing shutdown callback: stopping all scheduler notifications...")
     # Call the scheduler's cleanup method
-    scheduler.stop_all_notifications() 
+    await scheduler.stop_all_notifications()
     logger.info("Scheduler notifications stopped.")
 
 # --- Main Execution --- 
@@ -120,7 +119,10 @@ async def main(host: Optional[str], port: Optional[int]):
 
     logger.info("Server has shut down gracefully.")
 
-if __name__ == "__main__":
+def _cli():
+    """Parse command-line arguments and run the server with its tasks."""
+    import argparse
+
     parser = argparse.ArgumentParser(description="Run the Async Tasks Example MCP Server.")
     parser.add_argument(
         "--host",
@@ -136,10 +138,16 @@ if __name__ == "__main__":
     )
     args = parser.parse_args()
 
+    # Prefer a libuv/io_uring backed loop when one is installed
+    install_fast_loop()
+
     try:
         asyncio.run(main(host=args.host, port=args.port))
     except KeyboardInterrupt:
         logger.info("Runner received KeyboardInterrupt, exiting.")
     except Exception as e:
         logger.error(f"Critical error in runner: {e}", exc_info=True)
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1)
+
+if __name__ == "__main__":
+    _cli()
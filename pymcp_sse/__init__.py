@@ -4,8 +4,14 @@ PyMCP: Python Model Context Protocol Library
 
 __version__ = "0.1.0"
 
-from .server import BaseMCPServer
 from .client import BaseMCPClient, MultiMCPClient
 from .utils.log_setup import configure_logging, get_logger
 
+def __getattr__(name):
+    # The server (FastAPI/uvicorn) is only imported when first used
+    if name == "BaseMCPServer":
+        from .server import BaseMCPServer
+        return BaseMCPServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = ["BaseMCPServer", "BaseMCPClient", "MultiMCPClient", "configure_logging", "get_logger"]
@@ -4,3 +4,5 @@ MCP Client implementation
 
 from .base import BaseMCPClient
 from .multi import MultiMCPClient
+from .pool import ClientPool
+from ..utils.event_loop import install_fast_loop
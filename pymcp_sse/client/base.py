@@ -1,37 +1,106 @@
 """
 Base implementation of an MCP client using httpx and SSE.
 """
-import json
 import uuid
 import asyncio
+import itertools
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional, List, Callable, Awaitable, Union
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Union, AsyncIterator, Tuple
 
 import httpx
-from httpx_sse import aconnect_sse
 
 from ..utils.log_setup import get_logger
 from ..common.constants import *
 from ..common.utils import (
     format_jsonrpc_request,
+    format_jsonrpc_request_bytes,
     format_initialize_request,
     format_tool_call_request,
-    generate_request_id
+    json_dumps,
+    json_loads
 )
 from ..common.exceptions import (
     MCPError,
     MCPConnectionError,
     MCPInitializationError,
-    MCPToolError
+    MCPToolError,
+    MCPTimeoutError
 )
 
 # Get logger
 logger = get_logger("client.base")
 
+# Request bodies are pre-serialized, so the content type is set explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+SSE_HEADERS = {"Accept": "text/event-stream", "Cache-Control": "no-store"}
+
+async def _aiter_sse_frames(response: httpx.Response) -> AsyncIterator[Tuple[str, bytes]]:
+    """
+    Parse a raw SSE byte stream into (event, data) pairs.
+    
+    Chunks are accumulated in a single buffer and each complete frame is
+    dispatched as soon as its terminating blank line arrives, without building
+    intermediate event objects or decoding the data field.
+    
+    Args:
+        response: Streaming httpx response for the SSE endpoint
+        
+    Yields:
+        Tuples of (event type, raw data bytes)
+    """
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        if b"\r" in buffer:
+            # Normalize CRLF line endings; a CR split from its LF is fixed up on the next chunk
+            buffer = buffer.replace(b"\r\n", b"\n")
+            
+        while True:
+            end = buffer.find(b"\n\n")
+            if end == -1:
+                break
+            frame = bytes(buffer[:end])
+            del buffer[:end + 2]
+            
+            event = EVENT_MESSAGE
+            data_lines = []
+            for line in frame.split(b"\n"):
+                if not line or line[0] == 0x3A:  # Skip blank lines and ":" comments
+                    continue
+                field, _, value = line.partition(b":")
+                if value[:1] == b" ":
+                    value = value[1:]
+                if field == b"event":
+                    event = value.decode("utf-8")
+                elif field == b"data":
+                    data_lines.append(value)
+                    
+            if data_lines:
+                yield event, b"\n".join(data_lines)
+
 class BaseMCPClient:
     """Base MCP Client implementation with HTTP/SSE transport."""
     
+    # Fixed attribute layout: no per-instance __dict__ (subclasses may still add one)
+    __slots__ = (
+        # Configuration
+        "server_url", "client_id", "client_name", "client_version",
+        "reconnect_interval", "max_reconnect_attempts", "max_reconnect_delay",
+        "connect_timeout", "init_timeout", "tool_call_timeout",
+        "http_read_timeout", "http_connect_timeout", "http_transport", "http_limits", "http2",
+        # State
+        "connected", "initialized", "server_session_id", "message_endpoint",
+        "available_tools", "protocol_version", "tool_details",
+        # Transport
+        "http_client", "sse_client", "sse_task", "_bg_tasks", "_loop", "_closing",
+        "_request_id_prefix", "_request_counter",
+        "_event_handlers", "_endpoint_future", "_endpoint_received",
+        # Response handling
+        "pending_requests", "notification_callbacks", "concurrent_notifications",
+        "max_inflight_tool_calls", "_inflight", "_inflight_cond", "on_state_change",
+    )
+    
     def __init__(
         self,
         server_url: str,
@@ -45,7 +114,15 @@ class BaseMCPClient:
         init_timeout: int = 10,    # Timeout for initialize() response
         tool_call_timeout: int = 30, # Timeout for call_tool() response
         http_read_timeout: int = 30,  # HTTP read timeout
-        http_connect_timeout: int = 10 # HTTP connect timeout
+        http_connect_timeout: int = 10, # HTTP connect timeout
+        http_transport: Optional[httpx.AsyncBaseTransport] = None, # Custom transport (caller-owned)
+        http_max_connections: int = 64, # Connection pool size for JSON-RPC POSTs
+        http_max_keepalive_connections: int = 32, # Idle connections kept alive in the pool
+        http_keepalive_expiry: float = 30.0, # Seconds an idle pooled connection is kept
+        http2: bool = False, # Use HTTP/2 for JSON-RPC POSTs (requires `httpx[http2]`)
+        max_inflight_tool_calls: int = 64, # Concurrent call_tool() limit
+        concurrent_notifications: bool = True, # Run notification callbacks concurrently
+        on_state_change: Optional[Callable[[], None]] = None # Called when connection/session state changes
     ):
         """
         Initialize the MCP client.
@@ -63,6 +140,22 @@ class BaseMCPClient:
             tool_call_timeout: Seconds to wait for a tool call response
             http_read_timeout: Seconds to wait for reading data from the server (applies to SSE stream)
             http_connect_timeout: Seconds to wait for establishing the initial HTTP connection
+            http_transport: Optional httpx transport used for JSON-RPC POSTs (e.g. an
+                            aiohttp-backed transport). The SSE stream keeps its own connection.
+                            The caller owns the transport and is responsible for closing it;
+                            the client never closes it. httpx does not apply environment
+                            proxies (HTTP(S)_PROXY, NO_PROXY) to an explicit transport.
+            http_max_connections: Maximum number of concurrent connections used for JSON-RPC POSTs
+            http_max_keepalive_connections: Maximum number of idle keep-alive connections to retain
+            http_keepalive_expiry: Seconds before an idle keep-alive connection is closed
+            http2: Enable HTTP/2 for JSON-RPC POSTs (requires the `h2` package)
+            max_inflight_tool_calls: Maximum number of concurrent call_tool() requests; further
+                                     calls wait for a free slot (see set_max_inflight())
+            concurrent_notifications: Run notification callbacks concurrently; set to False to
+                                      await them one by one in registration order
+            on_state_change: Optional synchronous callback invoked with no arguments whenever
+                             `connected`, `initialized` or `available_tools` change, including
+                             reconnects and re-initialization done by the SSE listener
         """
         self.server_url = server_url.rstrip('/')
         self.client_id = client_id or str(uuid.uuid4())
@@ -76,6 +169,13 @@ class BaseMCPClient:
         self.tool_call_timeout = tool_call_timeout
         self.http_read_timeout = http_read_timeout
         self.http_connect_timeout = http_connect_timeout
+        self.http_transport = http_transport
+        self.http_limits = httpx.Limits(
+            max_connections=http_max_connections,
+            max_keepalive_connections=http_max_keepalive_connections,
+            keepalive_expiry=http_keepalive_expiry
+        )
+        self.http2 = http2
         
         # State
         self.connected = False
@@ -86,16 +186,58 @@ class BaseMCPClient:
         self.protocol_version: Optional[str] = None
         self.tool_details: Dict[str, Any] = {}
         
-        # Transport
+        # Transport (POSTs share a pooled client; the SSE stream gets its own)
         self.http_client: Optional[httpx.AsyncClient] = None
+        self.sse_client: Optional[httpx.AsyncClient] = None
         self.sse_task: Optional[asyncio.Task] = None
+        # Strong refs to background tasks (e.g. re-initialization) until they finish
+        self._bg_tasks: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None # Captured in connect()
+        self._closing = False # Set by close() so the SSE listener stops reconnecting
+        
+        # Request IDs: client ID prefix plus a per-client counter (no uuid per request)
+        self._request_id_prefix = self.client_id[:8]
+        self._request_counter = itertools.count(1)
+        
+        # SSE event dispatch (event type -> handler)
+        self._event_handlers: Dict[str, Callable[[bytes], Awaitable[None]]] = {
+            EVENT_ENDPOINT: self._on_endpoint,
+            EVENT_MESSAGE: self._on_message,
+            EVENT_PING: self._on_ping
+        }
+        self._endpoint_future: Optional[asyncio.Future] = None
+        self._endpoint_received = False
         
         # Response handling
         self.pending_requests: Dict[str, asyncio.Future] = {}
         self.notification_callbacks: List[Callable[[Dict], Awaitable[None]]] = []
+        self.concurrent_notifications = concurrent_notifications
+        
+        # Tool call admission control (counter guarded by a condition, safe to resize)
+        self.max_inflight_tool_calls = max_inflight_tool_calls
+        self._inflight = 0
+        self._inflight_cond = asyncio.Condition()
+        self.on_state_change = on_state_change
         
         logger.info(f"Initialized BaseMCPClient {self.client_id} for server {server_url}")
         
+    def _ensure_http_clients(self):
+        """Create the HTTP clients on first use; they persist until shutdown()."""
+        if self.http_client is not None:
+            return
+            
+        # Create HTTP clients with configured timeouts and pool limits
+        timeouts = httpx.Timeout(self.http_connect_timeout, read=self.http_read_timeout)
+        self.http_client = httpx.AsyncClient(
+            timeout=timeouts,
+            limits=self.http_limits,
+            http2=self.http2,
+            transport=self.http_transport
+        )
+        # Dedicated client (and transport) for the long-lived SSE stream so it never
+        # occupies a pooled POST slot, even when the POST transport is shared
+        self.sse_client = httpx.AsyncClient(timeout=timeouts)
+        
     async def connect(self) -> bool:
         """
         Connect to the MCP server.
@@ -107,9 +249,12 @@ class BaseMCPClient:
         if self.connected:
             await self.close()
             
-        # Create HTTP client with configured timeouts
-        timeouts = httpx.Timeout(self.http_connect_timeout, read=self.http_read_timeout)
-        self.http_client = httpx.AsyncClient(timeout=timeouts)
+        # Cache the running loop once; futures are created from it on the hot path
+        self._loop = asyncio.get_running_loop()
+            
+        # Reuse the HTTP clients (and their keep-alive pools) across reconnects
+        self._ensure_http_clients()
+        self._closing = False
         
         # Check server health first
         try:
@@ -133,12 +278,13 @@ class BaseMCPClient:
             logger.info(f"Connecting to SSE endpoint: {sse_url}")
             
             # Start SSE listener task
-            endpoint_future = asyncio.get_event_loop().create_future()
+            endpoint_future = self._loop.create_future()
             self.sse_task = asyncio.create_task(self._listen_sse(sse_url, endpoint_future))
             
             # Wait for endpoint info
             try:
-                endpoint_info = await asyncio.wait_for(endpoint_future, timeout=self.connect_timeout)
+                async with asyncio.timeout(self.connect_timeout):
+                    endpoint_info = await endpoint_future
                 self.message_endpoint = endpoint_info["endpoint"]
                 self.server_session_id = endpoint_info["server_session_id"]
                 logger.info(f"Received message endpoint: {self.message_endpoint}")
@@ -150,6 +296,7 @@ class BaseMCPClient:
                 
             # Mark as connected
             self.connected = True
+            self._state_changed()
             return True
             
         except Exception as e:
@@ -178,29 +325,33 @@ class BaseMCPClient:
             request = format_initialize_request(
                 client_name=self.client_name,
                 client_version=self.client_version,
-                protocol_version=PROTOCOL_VERSION
+                protocol_version=PROTOCOL_VERSION,
+                request_id=f"init-{self._next_request_id()}"
             )
             request_id = request["id"]
             
             # Create a future for the response
-            response_future = asyncio.get_event_loop().create_future()
+            response_future = self._loop.create_future()
             self.pending_requests[request_id] = response_future
             
             # Send the request
-            logger.info(f"Sending initialize request: {request}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sending initialize request: %s", request)
             response = await self.http_client.post(
                 self.message_endpoint,
-                json=request
+                content=json_dumps(request),
+                headers=JSON_HEADERS
             )
             
             if response.status_code != 202:
                 logger.error(f"Unexpected response to initialize: {response.status_code} {response.text}")
-                del self.pending_requests[request_id]
+                self.pending_requests.pop(request_id, None)
                 return False
                 
             # Wait for response via SSE
             try:
-                result = await asyncio.wait_for(response_future, timeout=self.init_timeout)
+                async with asyncio.timeout(self.init_timeout):
+                    result = await response_future
                 
                 if "error" in result:
                     logger.error(f"Initialize failed: {result['error']}")
@@ -211,15 +362,16 @@ class BaseMCPClient:
                     capabilities = result["result"]["capabilities"]
                     if "tools" in capabilities:
                         self.available_tools = capabilities["tools"]
-                        logger.info(f"Available tools: {self.available_tools}")
+                        logger.info("Available tools: %s", self.available_tools)
                         
                 # Mark as initialized
                 self.initialized = True
+                self._state_changed()
                 return True
                 
             except asyncio.TimeoutError:
                 logger.error("Timed out waiting for initialize response")
-                del self.pending_requests[request_id]
+                self.pending_requests.pop(request_id, None)
                 # Raise custom exception
                 raise MCPInitializationError("Timed out waiting for initialize response from server")
                 
@@ -251,30 +403,83 @@ class BaseMCPClient:
             # Raise custom exception
             raise MCPInitializationError("Cannot call tool: client session is not initialized")
             
-        # Create tool call request
-        request = format_tool_call_request(tool_name, kwargs)
-        request_id = request["id"]
+        # Wait for a free in-flight slot
+        async with self._inflight_cond:
+            await self._inflight_cond.wait_for(lambda: self._inflight < self.max_inflight_tool_calls)
+            self._inflight += 1
+            
+        try:
+            return await self._call_tool(tool_name, kwargs)
+        finally:
+            async with self._inflight_cond:
+                self._inflight -= 1
+                # Wake everyone: a woken batch may still lack slots that a single call could use
+                self._inflight_cond.notify_all()
+                
+    async def set_max_inflight(self, max_inflight: int):
+        """
+        Change the maximum number of concurrent tool calls.
+        
+        Args:
+            max_inflight: New limit (must be at least 1)
+        """
+        if max_inflight < 1:
+            raise ValueError("max_inflight must be at least 1")
+            
+        async with self._inflight_cond:
+            grown = max_inflight > self.max_inflight_tool_calls
+            self.max_inflight_tool_calls = max_inflight
+            if grown:
+                # Wake every waiter so the newly available slots are filled
+                self._inflight_cond.notify_all()
+        logger.info(f"Max in-flight tool calls set to {max_inflight}")
+        
+    def _state_changed(self):
+        """Invoke the on_state_change callback, if any."""
+        if self.on_state_change is not None:
+            self.on_state_change()
+            
+    def _next_request_id(self) -> str:
+        """Return the next request ID for this client."""
+        return f"{self._request_id_prefix}-{next(self._request_counter)}"
+        
+    async def _call_tool(self, tool_name: str, kwargs: Dict[str, Any]) -> Any:
+        """
+        Send a tool call request and wait for its response.
+        
+        Args:
+            tool_name: Name of the tool to call
+            kwargs: Tool parameters
+            
+        Returns:
+            Tool result
+        """
+        # Serialize the tool call request in one pass
+        request_id = f"call-{self._next_request_id()}"
+        body = format_jsonrpc_request_bytes(METHOD_TOOL_CALL, {"name": tool_name, "kwargs": kwargs}, request_id)
         
         # Create a future for the response
-        response_future = asyncio.get_event_loop().create_future()
+        response_future = self._loop.create_future()
         self.pending_requests[request_id] = response_future
         
         try:
             # Send the request
-            logger.info(f"Calling tool {tool_name} with params: {kwargs}")
+            logger.info("Calling tool %s with params: %s", tool_name, kwargs)
             response = await self.http_client.post(
                 self.message_endpoint,
-                json=request
+                content=body,
+                headers=JSON_HEADERS
             )
             
             if response.status_code != 202:
-                del self.pending_requests[request_id]
+                self.pending_requests.pop(request_id, None)
                 # Raise custom exception
                 raise MCPToolError(f"Unexpected server response to tool call: {response.status_code} {response.text}")
                 
             # Wait for response via SSE
             try:
-                result = await asyncio.wait_for(response_future, timeout=self.tool_call_timeout)
+                async with asyncio.timeout(self.tool_call_timeout):
+                    result = await response_future
                 
                 if "error" in result:
                     error = result["error"]
@@ -285,14 +490,122 @@ class BaseMCPClient:
                 
             except asyncio.TimeoutError:
                 # Raise custom exception
-                raise MCPToolError(f"Timed out waiting for tool call response for '{tool_name}'")
+                raise MCPTimeoutError(f"Timed out waiting for tool call response for '{tool_name}'")
                 
         except MCPError: # Re-raise specific MCP errors
             raise
         except Exception as e:
             # Wrap other exceptions
-            raise MCPToolError(f"Error during tool call '{tool_name}': {e}")
+            raise MCPToolError(f"Error during tool call '{tool_name}': {e}") from e
+
+    async def call_tools_batch(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Call several tools with a single JSON-RPC batch request.
+
+        All requests are sent in one POST; each response arrives individually via SSE.
+        The batch holds one in-flight slot per call (at most `max_inflight_tool_calls`)
+        until every response has arrived.
+
+        Args:
+            calls: List of (tool_name, kwargs) tuples
+            return_exceptions: If True, failed calls yield their MCPToolError in the
+                               result list instead of raising
+
+        Returns:
+            List of tool results in the same order as `calls`
+        """
+        if not self.connected:
+            raise MCPConnectionError("Cannot call tools: client is not connected")
+
+        if not self.initialized:
+            raise MCPInitializationError("Cannot call tools: client session is not initialized")
+
+        if not calls:
+            return []
+
+        # Wait until the batch's share of in-flight slots is free
+        async with self._inflight_cond:
+            await self._inflight_cond.wait_for(
+                lambda: self._inflight + min(len(calls), self.max_inflight_tool_calls) <= self.max_inflight_tool_calls
+            )
+            slots = min(len(calls), self.max_inflight_tool_calls)
+            self._inflight += slots
+            
+        try:
+            return await self._call_tools_batch(calls, return_exceptions)
+        finally:
+            async with self._inflight_cond:
+                self._inflight -= slots
+                self._inflight_cond.notify_all()
+                
+    async def _call_tools_batch(self, calls: List[Tuple[str, Dict[str, Any]]], return_exceptions: bool) -> List[Any]:
+        """
+        Send a batch of tool call requests and wait for all of their responses.
+        
+        Args:
+            calls: List of (tool_name, kwargs) tuples
+            return_exceptions: Whether failed calls are returned instead of raised
             
+        Returns:
+            List of tool results in the same order as `calls`
+        """
+        requests = [
+            format_tool_call_request(tool_name, kwargs, f"call-{self._next_request_id()}")
+            for tool_name, kwargs in calls
+        ]
+
+        # Register one future per request before sending, responses may arrive immediately
+        futures = []
+        for request in requests:
+            response_future = self._loop.create_future()
+            self.pending_requests[request["id"]] = response_future
+            futures.append(response_future)
+
+        try:
+            logger.info("Calling %d tools in one batch: %s", len(requests), [name for name, _ in calls])
+            response = await self.http_client.post(
+                self.message_endpoint,
+                content=json_dumps(requests),
+                headers=JSON_HEADERS
+            )
+
+            if response.status_code != 202:
+                raise MCPToolError(f"Unexpected server response to tool call batch: {response.status_code} {response.text}")
+
+        except Exception as e:
+            for request in requests:
+                self.pending_requests.pop(request["id"], None)
+            if isinstance(e, MCPError):
+                raise
+            raise MCPToolError(f"Error during tool call batch: {e}") from e
+
+        async def wait_for_result(tool_name: str, request_id: str, response_future: asyncio.Future) -> Any:
+            try:
+                async with asyncio.timeout(self.tool_call_timeout):
+                    result = await response_future
+            except asyncio.TimeoutError:
+                raise MCPTimeoutError(f"Timed out waiting for tool call response for '{tool_name}'")
+            finally:
+                self.pending_requests.pop(request_id, None)
+
+            if "error" in result:
+                error = result["error"]
+                raise MCPToolError(f"Tool call failed: {error['message']} (code: {error['code']})")
+
+            return result.get("result")
+
+        return await asyncio.gather(
+            *(
+                wait_for_result(tool_name, request["id"], response_future)
+                for (tool_name, _), request, response_future in zip(calls, requests, futures)
+            ),
+            return_exceptions=return_exceptions
+        )
+
     async def _listen_sse(self, sse_url: str, endpoint_future: asyncio.Future):
         """
         Listen for SSE events from the server.
@@ -302,76 +615,35 @@ class BaseMCPClient:
             endpoint_future: Future to complete with endpoint info
         """
         retry_count = 0
-        endpoint_received = False
+        self._endpoint_future = endpoint_future
+        self._endpoint_received = False
         
-        while retry_count < self.max_reconnect_attempts and self.http_client is not None:
+        while retry_count < self.max_reconnect_attempts and not self._closing:
             try:
                 logger.info(f"Connecting to SSE endpoint: {sse_url}")
                 
                 # Connect to SSE endpoint
-                async with aconnect_sse(self.http_client, "GET", sse_url) as event_source:
+                async with self.sse_client.stream("GET", sse_url, headers=SSE_HEADERS) as response:
+                    response.raise_for_status()
                     logger.info("SSE connection established")
                     retry_count = 0  # Reset retry count on successful connection
                     
                     # Process events
-                    async for event in event_source.aiter_sse():
-                        # Check if client is shutting down
-                        if self.http_client is None:
-                            logger.info("HTTP client closed, exiting SSE listener")
+                    async for event, event_data in _aiter_sse_frames(response):
+                        # Check if client is closing
+                        if self._closing:
+                            logger.info("Client closing, exiting SSE listener")
                             break
                             
+                        handler = self._event_handlers.get(event)
+                        if handler is None:
+                            logger.warning("Received unknown event type: %s", event)
+                            continue
+                            
                         try:
-                            # Handle the event based on type
-                            if event.event == EVENT_ENDPOINT:
-                                # Endpoint info - first event after connection or reconnection
-                                data = json.loads(event.data)
-                                new_endpoint = data["endpoint"]
-                                new_session_id = data["server_session_id"]
-                                
-                                # Check if this is a new session (reconnection case)
-                                if endpoint_received and (new_session_id != self.server_session_id):
-                                    logger.info(f"Received new session ID after reconnection: {new_session_id} (old: {self.server_session_id})")
-                                    # Update session info
-                                    self.message_endpoint = new_endpoint
-                                    self.server_session_id = new_session_id
-                                    self.initialized = False  # Mark as not initialized
-                                    
-                                    # Cancel any pending requests as they're for the old session
-                                    for request_id, future in list(self.pending_requests.items()):
-                                        if not future.done():
-                                            future.set_exception(
-                                                # Use custom exception
-                                                MCPConnectionError("Session reinitialized after reconnection")
-                                            )
-                                    self.pending_requests.clear()
-                                    
-                                    # Re-initialize the session
-                                    asyncio.create_task(self._reinitialize_after_reconnect())
-                                elif not endpoint_received:
-                                    # First connection
-                                    self.message_endpoint = new_endpoint
-                                    self.server_session_id = new_session_id
-                                    endpoint_received = True
-                                    
-                                    # Set the endpoint future if it's not done
-                                    if not endpoint_future.done():
-                                        endpoint_future.set_result(data)
-                                
-                            elif event.event == EVENT_MESSAGE:
-                                # JSON-RPC message
-                                message = json.loads(event.data)
-                                await self._handle_jsonrpc_message(message)
-                                
-                            elif event.event == EVENT_PING:
-                                # Ping event - can ignore, just keeps connection alive
-                                logger.debug(f"Received ping: {event.data}")
-                                
-                            else:
-                                # Unknown event type
-                                logger.warning(f"Received unknown event type: {event.event}")
-                                
+                            await handler(event_data)
                         except Exception as e:
-                            logger.error(f"Error processing SSE event: {e}", exc_info=True)
+                            logger.error("Error processing SSE event: %s", e, exc_info=True)
                     
                     logger.info("SSE connection closed normally")
                     
@@ -380,8 +652,8 @@ class BaseMCPClient:
                 break
                 
             except Exception as e:
-                if self.http_client is None:
-                    logger.info("HTTP client closed, exiting SSE listener")
+                if self._closing:
+                    logger.info("Client closing, exiting SSE listener")
                     break
                     
                 retry_count += 1
@@ -396,6 +668,7 @@ class BaseMCPClient:
                     logger.error("Max reconnection attempts reached, giving up")
                     # Mark as disconnected
                     self.connected = False
+                    self._state_changed()
                     
                     # Complete the endpoint future with an error if it's not done
                     if not endpoint_future.done():
@@ -408,6 +681,77 @@ class BaseMCPClient:
         # Clean up if we exit the loop
         logger.info("SSE listener exiting")
         
+    async def _on_endpoint(self, event_data: bytes):
+        """
+        Handle an `endpoint` event: first event after connection or reconnection.
+        
+        Args:
+            event_data: Raw event data (JSON with endpoint and server_session_id)
+        """
+        data = json_loads(event_data)
+        new_endpoint = data["endpoint"]
+        new_session_id = data["server_session_id"]
+        
+        # Check if this is a new session (reconnection case)
+        if self._endpoint_received and (new_session_id != self.server_session_id):
+            logger.info(f"Received new session ID after reconnection: {new_session_id} (old: {self.server_session_id})")
+            # Update session info
+            self.message_endpoint = new_endpoint
+            self.server_session_id = new_session_id
+            self.initialized = False  # Mark as not initialized
+            self._state_changed()
+            
+            # Fail any pending requests as they're for the old session
+            self._fail_pending(MCPConnectionError("Session reinitialized after reconnection"))
+            
+            # Re-initialize the session; tracked so the task can't be collected mid-flight
+            task = asyncio.create_task(self._reinitialize_after_reconnect())
+            self._bg_tasks.add(task)
+            task.add_done_callback(self._bg_tasks.discard)
+        elif not self._endpoint_received:
+            # First connection
+            self.message_endpoint = new_endpoint
+            self.server_session_id = new_session_id
+            self._endpoint_received = True
+            
+            # Set the endpoint future if it's not done
+            if self._endpoint_future is not None and not self._endpoint_future.done():
+                self._endpoint_future.set_result(data)
+                
+    async def _on_message(self, event_data: bytes):
+        """
+        Handle a `message` event carrying a JSON-RPC message.
+        
+        Args:
+            event_data: Raw event data (JSON-RPC message)
+        """
+        await self._handle_jsonrpc_message(json_loads(event_data))
+        
+    async def _on_ping(self, event_data: bytes):
+        """
+        Handle a `ping` event - can ignore, just keeps connection alive.
+        
+        Args:
+            event_data: Raw event data
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received ping: %r", event_data)
+            
+    def _fail_pending(self, exc: Exception):
+        """
+        Fail all outstanding requests with the given exception.
+        
+        The pending dict is swapped for a fresh one first, so responses or new
+        requests arriving meanwhile never see the old entries.
+        
+        Args:
+            exc: Exception to set on every unfinished future
+        """
+        pending, self.pending_requests = self.pending_requests, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+                
     async def _reinitialize_after_reconnect(self):
         """
         Reinitialize the session after reconnection with a new session ID.
@@ -421,6 +765,7 @@ class BaseMCPClient:
             logger.error("Failed to reinitialize session after reconnection")
             # Mark as disconnected if we can't reinitialize
             self.connected = False
+            self._state_changed()
         
     async def _handle_jsonrpc_message(self, message: Dict):
         """
@@ -429,34 +774,45 @@ class BaseMCPClient:
         Args:
             message: JSON-RPC message
         """
-        logger.debug(f"Received JSON-RPC message: {message}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received JSON-RPC message: %s", message)
         
-        # Handle responses to pending requests
-        if "id" in message and message["id"] in self.pending_requests:
-            request_id = message["id"]
-            future = self.pending_requests[request_id]
-            
+        # Handle responses to pending requests (single pop instead of lookup + delete)
+        future = self.pending_requests.pop(message.get("id"), None)
+        if future is not None:
             if not future.done():
                 future.set_result(message)
-                
-            del self.pending_requests[request_id]
             return
-            
+
         # Handle notifications
-        if "method" in message and message["method"] == METHOD_NOTIFICATION:
-            logger.info(f"Received notification: {message['params']}")
-            
-            # Call all notification callbacks
-            for callback in self.notification_callbacks:
-                try:
-                    await callback(message["params"])
-                except Exception as e:
-                    logger.error(f"Error in notification callback: {e}")
+        if message.get("method") == METHOD_NOTIFICATION:
+            logger.info("Received notification: %s", message["params"])
+            
+            params = message["params"]
+            if self.concurrent_notifications:
+                # Independent callbacks run concurrently so one doing I/O doesn't block the rest
+                await asyncio.gather(*(self._safe_call(callback, params) for callback in self.notification_callbacks))
+            else:
+                for callback in self.notification_callbacks:
+                    await self._safe_call(callback, params)
             return
             
         # Unknown message
-        logger.warning(f"Received unknown message: {message}")
+        logger.warning("Received unknown message: %s", message)
+        
+    async def _safe_call(self, callback: Callable[[Dict], Awaitable[None]], params: Dict):
+        """
+        Invoke a notification callback, logging instead of propagating its errors.
         
+        Args:
+            callback: Notification callback
+            params: Notification parameters
+        """
+        try:
+            await callback(params)
+        except Exception as e:
+            logger.error("Error in notification callback: %s", e)
+            
     def add_notification_callback(self, callback: Callable[[Dict], Awaitable[None]]):
         """
         Add a callback for notifications.
@@ -465,7 +821,7 @@ class BaseMCPClient:
             callback: Callback function that takes notification params
         """
         self.notification_callbacks.append(callback)
-        logger.debug(f"Added notification callback: {callback}")
+        logger.debug("Added notification callback: %s", callback)
         
     def remove_notification_callback(self, callback: Callable[[Dict], Awaitable[None]]):
         """
@@ -476,11 +832,17 @@ class BaseMCPClient:
         """
         if callback in self.notification_callbacks:
             self.notification_callbacks.remove(callback)
-            logger.debug(f"Removed notification callback: {callback}")
+            logger.debug("Removed notification callback: %s", callback)
             
     async def close(self):
-        """Close the client connection."""
+        """
+        Close the client connection.
+        
+        The HTTP clients and their keep-alive pools are kept so a later connect()
+        can reuse them; call shutdown() to release them.
+        """
         logger.info("Closing client connection")
+        self._closing = True
         
         # Cancel SSE listener task
         if self.sse_task and not self.sse_task.done():
@@ -490,27 +852,39 @@ class BaseMCPClient:
                 await self.sse_task
             except asyncio.CancelledError:
                 pass
-            
-        # Close HTTP client
-        if self.http_client:
-            logger.debug("Closing HTTP client")
-            http_client = self.http_client
-            self.http_client = None
-            await http_client.aclose()
+                
+        # Stop any in-flight re-initialization
+        if self._bg_tasks:
+            bg_tasks = list(self._bg_tasks)
+            for task in bg_tasks:
+                task.cancel()
+            await asyncio.gather(*bg_tasks, return_exceptions=True)
             
         # Clear state
         self.connected = False
         self.initialized = False
         self.server_session_id = None
         self.message_endpoint = None
+        self._state_changed()
         
-        # Clear any pending requests
-        for request_id, future in list(self.pending_requests.items()):
-            if not future.done():
-                future.set_exception(
-                    # Use custom exception
-                    MCPConnectionError("Client connection closed")
-                )
-        self.pending_requests.clear()
+        # Fail any pending requests
+        self._fail_pending(MCPConnectionError("Client connection closed"))
+        
+        logger.info("Client connection closed")
         
-        logger.info("Client connection closed") 
\ No newline at end of file
+    async def shutdown(self):
+        """Close the client connection and release the HTTP clients."""
+        await self.close()
+        
+        # Close HTTP clients
+        if self.http_client or self.sse_client:
+            logger.debug("Closing HTTP clients")
+            # An injected transport belongs to the caller; closing the POST client would close it
+            clients = [self.sse_client]
+            if self.http_transport is None:
+                clients.append(self.http_client)
+            self.http_client = None
+            self.sse_client = None
+            for http_client in clients:
+                if http_client is not None:
+                    await http_client.aclose()
@@ -6,13 +6,65 @@ This module provides a base class for LLM implementations that can be used with
 from abc import ABC, abstractmethod
 import asyncio
 import os
+import re
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 
 from ..utils import get_logger
+from ..common.utils import json_loads
 
 logger = get_logger("client.llm")
 
+# Default tool call guidance (matches the format parsed by BaseLLMClient.parse_tool_call)
+_DEFAULT_TOOL_INSTRUCTIONS = """
+When you need to call a tool, include a line in your response formatted exactly like this:
+TOOL_CALL: server=<server_name> tool=<tool_name> [param1=value1] [param2="value with spaces"] ...
+
+Replace <server_name> and <tool_name> with the actual server and tool names, and include any necessary parameters.
+Parameter values containing spaces must be enclosed in double quotes.
+
+Example:
+TOOL_CALL: server=weather_server tool=get_forecast location="New York" days=5
+
+Only include the TOOL_CALL line if you are actually invoking a tool. Be helpful and conversational in the rest of your response.
+"""
+
+# key=value pairs in a tool call line; group(2) is a quoted value, group(3) an unquoted one
+_PARAM_RE = re.compile(r'(\b\w+\b)\s*=\s*(?:"((?:\\"|[^"\\])*)"|([^\s"]+))')
+
+@lru_cache(maxsize=None)
+def _tool_call_line_re(prefix: str) -> "re.Pattern[str]":
+    """Compile (once per prefix) the pattern matching a tool call line."""
+    return re.compile(rf"^{re.escape(prefix)}\s*(.*?)$", re.MULTILINE)
+
+def _coerce_param_value(value: str) -> Any:
+    """
+    Interpret a raw parameter value from a tool call line.
+    
+    Args:
+        value: Raw parameter value
+        
+    Returns:
+        The JSON-decoded value if possible, else a bool/int/float/str by simple heuristics
+    """
+    try:
+        # Try JSON decoding first for complex types
+        return json_loads(value)
+    except ValueError:
+        pass
+        
+    lowered = value.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    if value.isdigit():
+        return int(value)
+    if value.count(".") == 1 and value.replace(".", "", 1).isdigit():
+        return float(value)
+    return value
+
 class BaseLLMClient(ABC):
     """
     Abstract base class for LLM clients in PyMCP.
@@ -78,11 +130,15 @@ class BaseLLMClient(ABC):
         """
         pass
     
-    @abstractmethod
     def parse_tool_call(self, response: str) -> Optional[Tuple[str, str, Dict[str, Any]]]:
         """
         Parse the LLM's response text to find a tool call instruction.
         
+        The default implementation understands the format described by
+        get_default_tool_instructions(), anchored on `tool_call_prefix`:
+        `<prefix> server=X tool=Y param1="value 1" param2=123 ...`
+        Subclasses only need to override this for a different format.
+        
         Args:
             response: The raw text response from the LLM.
             
@@ -90,26 +146,41 @@ class BaseLLMClient(ABC):
             A tuple (server_name, tool_name, parameters) if a tool call is found,
             otherwise None.
         """
-        pass
+        line_match = _tool_call_line_re(self.tool_call_prefix).search(response)
+        if not line_match:
+            return None
+            
+        tool_call_line = line_match.group(1).strip()
+        server_name = None
+        tool_name = None
+        params: Dict[str, Any] = {}
+        
+        # Single scan over the line: server/tool names and parameters share the key=value grammar
+        for match in _PARAM_RE.finditer(tool_call_line):
+            name, quoted, unquoted = match.groups()
+            if name == "server":
+                server_name = quoted if quoted is not None else unquoted
+            elif name == "tool":
+                tool_name = quoted if quoted is not None else unquoted
+            elif quoted is not None:
+                params[name] = _coerce_param_value(quoted.replace('\\"', '"'))
+            else:
+                params[name] = _coerce_param_value(unquoted)
+                
+        if not server_name or not tool_name:
+            logger.warning("Invalid tool call format (missing server or tool): %s", tool_call_line)
+            return None
+            
+        return server_name, tool_name, params
 
-    @abstractmethod
     def get_default_tool_instructions(self) -> str:
         """
         Get the default instructions for how the LLM should format tool calls.
         This can be appended to the system instructions.
         
+        Subclasses override this only if they want different guidance.
+        
         Returns:
             str: Default tool usage instructions
         """
-        return """
-When you need to call a tool, include a line in your response formatted exactly like this:
-TOOL_CALL: server=<server_name> tool=<tool_name> [param1=value1] [param2="value with spaces"] ...
-
-Replace <server_name> and <tool_name> with the actual server and tool names, and include any necessary parameters.
-Parameter values containing spaces must be enclosed in double quotes.
-
-Example:
-TOOL_CALL: server=weather_server tool=get_forecast location="New York" days=5
-
-Only include the TOOL_CALL line if you are actually invoking a tool. Be helpful and conversational in the rest of your response.
-""" 
\ No newline at end of file
+        return _DEFAULT_TOOL_INSTRUCTIONS
@@ -2,15 +2,75 @@
 Multi-server client implementation for MCP.
 """
 import asyncio
-from typing import Dict, Any, Optional, List, Union, Callable, Awaitable
+import functools
+import hashlib
+import json
+import os
+import random
+import time
+import urllib.request
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Union, Callable, Awaitable, Mapping
+
+import httpx
 
 from ..utils.log_setup import get_logger
+from ..common.constants import PROTOCOL_VERSION
 from .base import BaseMCPClient
-from ..common.exceptions import MCPError # Import base exception
+from ..common.exceptions import MCPError, MCPConnectionError, MCPTimeoutError # Import base exception
 
 # Get logger
 logger = get_logger("client.multi")
 
+async def _forward(alias: str, callback: Callable[[str, Dict], Awaitable[None]], params: Dict):
+    """Forward a client notification to a multi-server callback, tagged with its server alias."""
+    await callback(alias, params)
+
+class _Breaker:
+    """
+    Circuit breaker state for one server.
+    
+    Closed until `fail_threshold` consecutive failures, then open (calls fail fast)
+    for `reset_after` seconds, then half-open: one trial call decides whether it
+    closes again or re-opens.
+    """
+    __slots__ = ("fail_count", "opened_at", "trial_in_flight")
+    
+    def __init__(self):
+        self.fail_count = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        
+    def allow(self, reset_after: float) -> bool:
+        """Check whether a call may go through, claiming the half-open trial if due."""
+        if self.opened_at is None:
+            return True
+        if self.trial_in_flight or time.monotonic() - self.opened_at < reset_after:
+            return False
+        self.trial_in_flight = True
+        return True
+        
+    def record_success(self):
+        self.fail_count = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        
+    def record_failure(self, fail_threshold: int) -> bool:
+        """Count a failure; returns True if the breaker (re)opened."""
+        self.fail_count += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.fail_count >= fail_threshold:
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+def _is_server_failure(error: BaseException) -> bool:
+    """Whether an exception means the server is unreachable/unresponsive (vs. a tool-level error)."""
+    if isinstance(error, (MCPConnectionError, MCPTimeoutError, asyncio.TimeoutError)):
+        return True
+    # Transport failures reach us wrapped in MCPToolError
+    return isinstance(error.__cause__, httpx.TransportError) or isinstance(error, httpx.TransportError)
+
 class MultiMCPClient:
     """Client for connecting to multiple MCP servers."""
     
@@ -21,65 +81,175 @@ class MultiMCPClient:
         Args:
             servers: Dictionary mapping server aliases to URLs
             **kwargs: Additional arguments to pass to BaseMCPClient constructor
-                      (e.g., http_read_timeout, http_connect_timeout)
+                      (e.g., http_read_timeout, http_connect_timeout).
+                      `connect_concurrency` (default 10) is consumed here and limits
+                      how many servers connect_all() connects to at once.
+                      `retry_max` (default 3 attempts), `retry_base` (1.0s), `retry_cap` (30s)
+                      and `retry_jitter` (0.5) are also consumed here and control the
+                      exponential backoff between connection attempts to a server.
+                      Unless an `http_transport` is given, all clients send their POSTs
+                      through one pooled transport sized by `shared_max_connections`
+                      (default 100) and `shared_max_keepalive_connections` (default 20);
+                      SSE streams use per-client connections outside that pool. The pool
+                      is not shared when proxy environment variables (HTTP(S)_PROXY,
+                      ALL_PROXY) are set, since httpx ignores them for explicit transports.
+                      `tool_cache_path` (default None, disabled) names a JSON file in which
+                      describe_tools results are cached across restarts for
+                      `tool_cache_ttl` seconds (default 3600).
+                      `breaker_fail_threshold` (default 5) consecutive connection failures
+                      or timeouts open a per-server circuit breaker, making call_tool()
+                      fail fast for `breaker_reset_after` seconds (default 30).
+                      `on_state_change` is set by MultiMCPClient on every sub-client and
+                      cannot be passed here.
         """
+        if "on_state_change" in kwargs:
+            raise ValueError("on_state_change is managed by MultiMCPClient")
         self.server_urls = servers
         self.clients: Dict[str, BaseMCPClient] = {}
+        self._connect_concurrency = kwargs.pop("connect_concurrency", 10)
+        self._retry_max = max(1, kwargs.pop("retry_max", 3))
+        self._retry_base = kwargs.pop("retry_base", 1.0)
+        self._retry_cap = kwargs.pop("retry_cap", 30.0)
+        self._retry_jitter = kwargs.pop("retry_jitter", 0.5)
+        self._shared_limits = httpx.Limits(
+            max_connections=kwargs.pop("shared_max_connections", 100),
+            max_keepalive_connections=kwargs.pop("shared_max_keepalive_connections", 20),
+            keepalive_expiry=30.0
+        )
+        # Shared transport (one connection pool for all servers), created on demand and owned here.
+        # httpx only applies environment proxies to the transports it builds itself, so with a
+        # proxy configured each client keeps its own default transport instead
+        proxied = any(scheme != "no" for scheme in urllib.request.getproxies())
+        self._owns_transport = kwargs.get("http_transport") is None and not proxied
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+        # Optional on-disk cache of describe_tools results, keyed by server URL + protocol version
+        tool_cache_path = kwargs.pop("tool_cache_path", None)
+        self._tool_cache_path = os.path.expanduser(tool_cache_path) if tool_cache_path else None
+        self._tool_cache_ttl = kwargs.pop("tool_cache_ttl", 3600)
+        self._tool_cache: Optional[Dict[str, Any]] = None # Loaded lazily
+        # Per-server circuit breakers for call_tool()
+        self._breaker_fail_threshold = kwargs.pop("breaker_fail_threshold", 5)
+        self._breaker_reset_after = kwargs.pop("breaker_reset_after", 30.0)
+        self._breakers: Dict[str, _Breaker] = {}
+        # get_server_info() snapshot, dropped whenever a client's state changes
+        self._info_cache: Optional[Mapping[str, Mapping[str, Any]]] = None
         self.client_kwargs = kwargs
         logger.info(f"Initialized MultiMCPClient with {len(servers)} servers")
         
+    def _get_shared_transport(self) -> httpx.AsyncHTTPTransport:
+        """Get (creating if needed) the POST transport shared by all sub-clients."""
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport(
+                limits=self._shared_limits,
+                http2=self.client_kwargs.get("http2", False)
+            )
+        return self._transport
+        
     async def _connect_and_init_single(self, alias: str, url: str) -> Dict[str, Any]:
         """Connect and initialize a single client."""
         logger.info(f"Attempting connection to server '{alias}' at {url}")
         # Pass stored kwargs to BaseMCPClient
-        client = BaseMCPClient(url, client_name=f"MultiMCPClient_{alias}", **self.client_kwargs)
+        client_kwargs = {**self.client_kwargs, "on_state_change": self._invalidate_server_info}
+        if self._owns_transport:
+            client_kwargs["http_transport"] = self._get_shared_transport()
+        # Cheap to build: HTTP clients are only created by the first connect()
+        client = BaseMCPClient(url, client_name=f"MultiMCPClient_{alias}", **client_kwargs)
         
         try:
-            connected = await client.connect()
-            if not connected:
+            # Retry transient connection failures with exponential backoff + jitter
+            for attempt in range(self._retry_max):
+                try:
+                    connected = await client.connect()
+                    error = "Connection refused or health check failed"
+                except (MCPConnectionError, asyncio.TimeoutError) as e:
+                    connected = False
+                    error = str(e) or type(e).__name__
+                    
+                if connected:
+                    break
+                    
+                if attempt + 1 < self._retry_max:
+                    delay = min(self._retry_cap, self._retry_base * 2 ** attempt) * (1 + random.uniform(0, self._retry_jitter))
+                    logger.warning(f"Connection to server '{alias}' failed (attempt {attempt + 1}/{self._retry_max}), retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+            else:
                 # Connection failed before initialization
-                await client.close() # Ensure cleanup
-                return {"success": False, "error": "Connection refused or health check failed", "client": None}
+                await client.shutdown() # Ensure cleanup
+                return {"success": False, "error": error, "client": None}
                 
+            # Initialization failures are not retried
             initialized = await client.initialize()
             if not initialized:
                 # If initialization failed after successful connection
-                await client.close() # Ensure cleanup
+                await client.shutdown() # Ensure cleanup
                 return {"success": False, "error": "Initialization failed after connection", "client": None}
                 
             logger.info(f"Successfully connected and initialized server '{alias}'")
             return {"success": True, "error": None, "client": client}
         except MCPError as e:
             logger.error(f"MCPError connecting to server '{alias}': {e}")
-            await client.close() # Ensure cleanup
+            await client.shutdown() # Ensure cleanup
             return {"success": False, "error": str(e), "client": None}
+        except asyncio.CancelledError:
+            # Deadline hit (or caller cancelled): release the half-open connection
+            await client.shutdown()
+            raise
         except Exception as e:
             logger.error(f"Unexpected error connecting to server '{alias}': {e}")
-            await client.close() # Ensure cleanup
+            await client.shutdown() # Ensure cleanup
             return {"success": False, "error": f"Unexpected error: {e}", "client": None}
 
-    async def connect_all(self) -> Dict[str, Dict[str, Any]]:
+    async def connect_all(self, total_timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
         """
         Connect concurrently to all configured servers.
         
+        Args:
+            total_timeout: Optional overall deadline in seconds for the connection phase.
+                           Servers still connecting when it expires are cancelled and
+                           reported as failed.
+        
         Returns:
             Dictionary mapping server aliases to connection results.
             Each result is a dict: {'success': bool, 'error': Optional[str]}
         """
-        tasks = [
-            self._connect_and_init_single(alias, url) 
+        # Bound simultaneous handshakes (DNS, TCP/TLS, SSE + initialize) on large fan-outs
+        semaphore = asyncio.Semaphore(self._connect_concurrency)
+        
+        async def connect_limited(alias: str, url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._connect_and_init_single(alias, url)
+                
+        # Explicit tasks so the ones still running at the deadline can be cancelled
+        tasks = {
+            alias: asyncio.create_task(connect_limited(alias, url))
             for alias, url in self.server_urls.items()
-        ]
+        }
         
         logger.info(f"Starting concurrent connection attempts to {len(tasks)} servers...")
-        connection_results = await asyncio.gather(*tasks)
-        
+        if tasks:
+            try:
+                # asyncio.wait never raises for a failing task, so one server can't affect the others
+                async with asyncio.timeout(total_timeout):
+                    await asyncio.wait(tasks.values())
+            except TimeoutError:
+                pending = [task for task in tasks.values() if not task.done()]
+                logger.warning(f"Startup deadline of {total_timeout}s exceeded, cancelling {len(pending)} pending connections")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                
         final_results = {}
         successful_connections = 0
         
-        # Process results and populate self.clients
-        for i, alias in enumerate(self.server_urls.keys()):
-            result = connection_results[i]
+        # Process results (each task is paired with its alias) and populate self.clients
+        for alias, task in tasks.items():
+            if task.cancelled():
+                result = {"success": False, "error": "startup deadline exceeded", "client": None}
+            elif task.exception() is not None:
+                logger.error(f"Connection attempt to server '{alias}' raised: {task.exception()!r}")
+                result = {"success": False, "error": repr(task.exception()), "client": None}
+            else:
+                result = task.result()
             final_results[alias] = {
                 "success": result["success"],
                 "error": result["error"]
@@ -89,13 +259,13 @@ class MultiMCPClient:
                 successful_connections += 1
             else:
                 # Ensure failed clients are not stored
-                if alias in self.clients:
-                    del self.clients[alias]
+                self.clients.pop(alias, None)
                 
         logger.info(f"Finished connection attempts. Successfully connected to {successful_connections}/{len(self.server_urls)} servers")
         
         # Try to fetch tool details from each server that has the describe_tools endpoint
         await self._fetch_tool_details()
+        self._invalidate_server_info()
         
         return final_results
         
@@ -103,19 +273,112 @@ class MultiMCPClient:
         """
         Attempt to fetch detailed tool information from servers that support the describe_tools endpoint.
         """
+        to_fetch = []
         for alias, client in self.clients.items():
-            if "describe_tools" in client.available_tools:
-                try:
-                    logger.info(f"Fetching detailed tool information from server '{alias}'")
-                    # Call the describe_tools endpoint
-                    client.tool_details = await client.call_tool("describe_tools")
-                    logger.info(f"Retrieved detailed information for {len(client.tool_details)} tools from '{alias}'")
-                except Exception as e:
-                    logger.warning(f"Failed to fetch tool details from server '{alias}': {e}")
-                    client.tool_details = {}
+            if "describe_tools" not in client.available_tools:
+                client.tool_details = {}
+                continue
+                
+            cached = self._get_cached_tool_details(client)
+            if cached is not None:
+                logger.info(f"Using cached tool details for server '{alias}'")
+                client.tool_details = cached
             else:
+                to_fetch.append((alias, client))
+                
+        if not to_fetch:
+            return
+            
+        # Fan out: total latency is the slowest server, not the sum over servers
+        logger.info(f"Fetching detailed tool information from {len(to_fetch)} servers")
+        results = await asyncio.gather(
+            *(client.call_tool("describe_tools") for _, client in to_fetch),
+            return_exceptions=True
+        )
+        
+        cache_updated = False
+        for (alias, client), result in zip(to_fetch, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to fetch tool details from server '{alias}': {result}")
                 client.tool_details = {}
+                continue
+                
+            client.tool_details = result
+            logger.info(f"Retrieved detailed information for {len(client.tool_details)} tools from '{alias}'")
+            cache_updated |= self._store_cached_tool_details(client)
+            
+        self._invalidate_server_info()
+        if cache_updated:
+            self._save_tool_cache()
+            
+    def _tool_cache_key(self, client: BaseMCPClient) -> str:
+        """Cache key for a server's tool details."""
+        return hashlib.sha1(f"{client.server_url}|{PROTOCOL_VERSION}".encode("utf-8")).hexdigest()
         
+    def _load_tool_cache(self) -> Dict[str, Any]:
+        """Load the tool details cache file on first use."""
+        if self._tool_cache is None:
+            self._tool_cache = {}
+            if self._tool_cache_path and os.path.exists(self._tool_cache_path):
+                try:
+                    with open(self._tool_cache_path, "r", encoding="utf-8") as f:
+                        self._tool_cache = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable tool cache {self._tool_cache_path}: {e}")
+        return self._tool_cache
+        
+    def _get_cached_tool_details(self, client: BaseMCPClient) -> Optional[Dict[str, Any]]:
+        """
+        Get cached tool details for a server, if fresh.
+        
+        Args:
+            client: Connected, initialized client
+            
+        Returns:
+            Cached tool details, or None on a miss, an expired entry, or a changed tool list
+        """
+        if not self._tool_cache_path:
+            return None
+            
+        entry = self._load_tool_cache().get(self._tool_cache_key(client))
+        if not isinstance(entry, dict):
+            return None
+        if time.time() - entry.get("stored_at", 0) > self._tool_cache_ttl:
+            return None
+        # The server's advertised tools must still match what was cached
+        if entry.get("available_tools") != sorted(client.available_tools):
+            return None
+        return entry.get("tool_details")
+        
+    def _store_cached_tool_details(self, client: BaseMCPClient) -> bool:
+        """
+        Record a server's tool details in the in-memory cache.
+        
+        Returns:
+            True if the cache changed and should be saved
+        """
+        if not self._tool_cache_path or not isinstance(client.tool_details, dict):
+            return False
+            
+        self._load_tool_cache()[self._tool_cache_key(client)] = {
+            "server_url": client.server_url,
+            "stored_at": time.time(),
+            "available_tools": sorted(client.available_tools),
+            "tool_details": client.tool_details
+        }
+        return True
+        
+    def _save_tool_cache(self):
+        """Write the tool details cache to disk (atomically, via a temporary file)."""
+        try:
+            os.makedirs(os.path.dirname(self._tool_cache_path) or ".", exist_ok=True)
+            tmp_path = f"{self._tool_cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._tool_cache, f)
+            os.replace(tmp_path, self._tool_cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write tool cache {self._tool_cache_path}: {e}")
+            
     async def call_tool(self, server_alias: str, tool_name: str, **kwargs) -> Any:
         """
         Call a tool on a specific server.
@@ -130,36 +393,69 @@ class MultiMCPClient:
             
         Raises:
             KeyError: If the server alias is unknown
-            ValueError: If the tool call fails
+            MCPConnectionError: If the server's circuit breaker is open
+            MCPToolError: If the tool call fails
         """
         if server_alias not in self.clients:
             raise KeyError(f"Unknown server alias: {server_alias}")
             
+        breaker = self._breakers.get(server_alias)
+        if breaker is None:
+            breaker = self._breakers[server_alias] = _Breaker()
+        if not breaker.allow(self._breaker_reset_after):
+            raise MCPConnectionError(f"Circuit open for server '{server_alias}' after repeated failures")
+            
         client = self.clients[server_alias]
         logger.info(f"Calling tool '{tool_name}' on server '{server_alias}'")
-        return await client.call_tool(tool_name, **kwargs)
+        try:
+            result = await client.call_tool(tool_name, **kwargs)
+        except Exception as e:
+            if not _is_server_failure(e):
+                # The server answered (e.g. a tool error), so it is healthy
+                breaker.record_success()
+            elif breaker.record_failure(self._breaker_fail_threshold):
+                logger.warning(f"Circuit opened for server '{server_alias}' for {self._breaker_reset_after}s: {e}")
+            raise
+        except BaseException:
+            # Cancelled: release a claimed half-open trial without judging the server
+            breaker.trial_in_flight = False
+            raise
+            
+        breaker.record_success()
+        return result
         
-    def get_server_info(self) -> Dict[str, Dict[str, Any]]:
+    def _invalidate_server_info(self):
+        """Drop the cached get_server_info() result."""
+        self._info_cache = None
+        
+    def get_server_info(self) -> Mapping[str, Mapping[str, Any]]:
         """
         Get information about all connected servers.
         
+        The result is cached until a client's connection or session state changes,
+        and is returned as a read-only mapping.
+        
         Returns:
-            Dictionary mapping server aliases to server info
+            Read-only mapping of server aliases to server info
         """
+        if self._info_cache is not None:
+            return self._info_cache
+            
         info = {}
         
         for alias, client in self.clients.items():
             status = "connected" if client.connected else "disconnected"
             initialized = client.initialized
             
-            info[alias] = {
+            info[alias] = MappingProxyType({
                 "status": status,
                 "initialized": initialized,
                 "available_tools": client.available_tools if initialized else [],
-                "tool_details": client.tool_details if initialized and hasattr(client, "tool_details") else {}
-            }
+                "tool_details": client.tool_details if initialized else {}
+            })
             
-        return info
+        self._info_cache = MappingProxyType(info)
+        return self._info_cache
         
     def add_notification_callback(self, server_alias: Optional[str], callback: Callable[[str, Dict], Awaitable[None]]):
         """
@@ -188,10 +484,7 @@ class MultiMCPClient:
             client: Client instance
             callback: Callback function
         """
-        async def wrapped_callback(params: Dict):
-            await callback(alias, params)
-            
-        client.add_notification_callback(wrapped_callback)
+        client.add_notification_callback(functools.partial(_forward, alias, callback))
         
     async def close(self):
         """Close all client connections."""
@@ -199,11 +492,22 @@ class MultiMCPClient:
         
         close_tasks = []
         for alias, client in self.clients.items():
-            logger.debug(f"Closing connection to server '{alias}'")
-            close_tasks.append(client.close())
+            logger.debug("Closing connection to server '%s'", alias)
+            close_tasks.append(client.shutdown())
             
         if close_tasks:
-            await asyncio.gather(*close_tasks)
+            # Close every client even if some of them fail
+            results = await asyncio.gather(*close_tasks, return_exceptions=True)
+            for alias, result in zip(self.clients.keys(), results):
+                if isinstance(result, BaseException):
+                    logger.warning(f"Error closing connection to server '{alias}': {result!r}")
             
         self.clients.clear()
+        self._invalidate_server_info()
+        
+        # Sub-clients never close an injected transport; the shared one is ours to close
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+            
         logger.info("All client connections closed") 
\ No newline at end of file
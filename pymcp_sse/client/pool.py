@@ -0,0 +1,126 @@
+"""
+Pool of reusable MCP clients keyed by server URL.
+"""
+import asyncio
+from typing import Dict
+
+from ..utils.log_setup import get_logger
+from .base import BaseMCPClient
+from ..common.exceptions import MCPConnectionError, MCPInitializationError
+
+# Get logger
+logger = get_logger("client.pool")
+
+class ClientPool:
+    """
+    Process-wide pool of connected, initialized clients.
+
+    In reuse mode (the default) one client per server URL is kept connected and
+    handed out to every caller, so the SSE connection and session initialization
+    are paid once instead of per logical request. Close the pool at application
+    shutdown, e.g. from a FastAPI lifespan handler or with `async with ClientPool()`.
+    """
+
+    def __init__(self, reuse_mode: bool = True, **kwargs):
+        """
+        Initialize the client pool.
+
+        Args:
+            reuse_mode: If True, cache one client per server URL; if False, every
+                        acquire() opens a fresh client and release() shuts it down
+            **kwargs: Additional arguments to pass to BaseMCPClient constructor
+                      (e.g., http_read_timeout, http_connect_timeout)
+        """
+        self.reuse_mode = reuse_mode
+        self.client_kwargs = kwargs
+        self.clients: Dict[str, BaseMCPClient] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        logger.info(f"Initialized ClientPool (reuse_mode={reuse_mode})")
+
+    async def acquire(self, server_url: str) -> BaseMCPClient:
+        """
+        Get a connected, initialized client for a server.
+
+        Args:
+            server_url: Base URL of the MCP server
+
+        Returns:
+            A ready-to-use client
+
+        Raises:
+            MCPConnectionError: If the client cannot connect
+            MCPInitializationError: If the session cannot be initialized
+        """
+        server_url = server_url.rstrip('/')
+        if not self.reuse_mode:
+            return await self._open(BaseMCPClient(server_url, **self.client_kwargs))
+
+        # Per-URL lock: concurrent acquires for one server share a single connect
+        async with self._locks.setdefault(server_url, asyncio.Lock()):
+            client = self.clients.get(server_url)
+            if client is not None and client.connected and client.initialized:
+                return client
+
+            if client is None:
+                client = BaseMCPClient(server_url, **self.client_kwargs)
+            else:
+                logger.info(f"Reconnecting pooled client for {server_url}")
+
+            try:
+                await self._open(client)
+            except Exception:
+                self.clients.pop(server_url, None)
+                raise
+
+            self.clients[server_url] = client
+            return client
+
+    async def release(self, client: BaseMCPClient):
+        """
+        Return a client obtained from acquire().
+
+        Pooled clients stay connected for the next caller; in per-request mode
+        the client is shut down.
+
+        Args:
+            client: Client to release
+        """
+        if not self.reuse_mode or self.clients.get(client.server_url) is not client:
+            await client.shutdown()
+
+    async def close_all(self):
+        """Shut down every pooled client."""
+        logger.info(f"Closing {len(self.clients)} pooled clients")
+        clients = list(self.clients.values())
+        self.clients.clear()
+        if clients:
+            await asyncio.gather(*(client.shutdown() for client in clients), return_exceptions=True)
+        logger.info("All pooled clients closed")
+
+    async def _open(self, client: BaseMCPClient) -> BaseMCPClient:
+        """
+        Connect and initialize a client, shutting it down on failure.
+
+        Args:
+            client: Client to open
+
+        Returns:
+            The same client, connected and initialized
+        """
+        try:
+            if not client.connected and not await client.connect():
+                raise MCPConnectionError(f"Failed to connect to {client.server_url}")
+
+            if not client.initialized and not await client.initialize():
+                raise MCPInitializationError(f"Failed to initialize session with {client.server_url}")
+        except Exception:
+            await client.shutdown()
+            raise
+
+        return client
+
+    async def __aenter__(self) -> "ClientPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close_all()
@@ -43,4 +43,5 @@ NOTIFICATION_DATA = "data"
 # Default values
 DEFAULT_PING_INTERVAL = 30  # seconds
 DEFAULT_RECONNECT_INTERVAL = 1  # seconds
-DEFAULT_MAX_RECONNECT_ATTEMPTS = 5 
\ No newline at end of file
+DEFAULT_MAX_RECONNECT_ATTEMPTS = 5
+DEFAULT_MAX_QUEUE_SIZE = 1024  # queued SSE events per client connection
@@ -16,4 +16,8 @@ class MCPInitializationError(MCPError):
 
 class MCPToolError(MCPError):
     """Error during a tool call execution."""
-    pass 
\ No newline at end of file
+    pass
+
+class MCPTimeoutError(MCPToolError):
+    """Timed out waiting for a tool call response from the server."""
+    pass
@@ -3,7 +3,8 @@ Pydantic models for MCP protocol messages.
 """
 from typing import Dict, Any, Optional, List, Union
 from pydantic import BaseModel, Field
-from datetime import datetime
+
+from .utils import iso_timestamp
 
 class ClientInfo(BaseModel):
     """Client information sent during initialization."""
@@ -58,7 +59,7 @@ class NotificationParams(BaseModel):
     """Parameters for a notification."""
     type: str
     message: str
-    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+    timestamp: str = Field(default_factory=iso_timestamp)
     data: Optional[Dict[str, Any]] = None
 
 class Notification(BaseModel):
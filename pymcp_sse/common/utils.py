@@ -1,11 +1,19 @@
 """
 Utility functions for MCP protocol.
 """
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
+import itertools
 import json
-import uuid
+import os
+import random
+import time
 from datetime import datetime
 
+try:
+    import orjson  # Optional fast JSON backend (pip install pymcp-sse[speedups])
+except ImportError:
+    orjson = None
+
 from .constants import (
     JSONRPC_VERSION,
     METHOD_NOTIFICATION,
@@ -13,9 +21,67 @@ from .constants import (
     METHOD_INITIALIZE
 )
 
+def json_dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON, using orjson when available.
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Fall back to the stdlib for values orjson rejects (e.g. ints over 64 bits)
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document, using orjson when available.
+    
+    Args:
+        data: JSON document as str or bytes
+        
+    Returns:
+        Parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Request ID source: random per-process prefix bits plus a counter. IDs only correlate
+# responses with requests, so they need to be unique, not unpredictable.
+_request_id_rng = random.Random(os.urandom(16))
+_request_id_counter = itertools.count()
+
 def generate_request_id() -> str:
     """Generate a unique request ID."""
-    return str(uuid.uuid4())
+    return f"{_request_id_rng.getrandbits(64):016x}{next(_request_id_counter):08x}"
+
+# Last formatted timestamp, reused for calls within the same millisecond
+_last_timestamp_mono = -1.0
+_last_timestamp = ""
+
+def iso_timestamp() -> str:
+    """
+    Get the current local time as an ISO 8601 string, cached at 1 ms resolution.
+    
+    Bursts of notifications share one formatted string instead of formatting
+    a datetime per message.
+    
+    Returns:
+        ISO 8601 timestamp
+    """
+    global _last_timestamp_mono, _last_timestamp
+    now = time.monotonic()
+    if now - _last_timestamp_mono >= 0.001:
+        _last_timestamp = datetime.now().isoformat()
+        _last_timestamp_mono = now
+    return _last_timestamp
 
 def format_jsonrpc_request(method: str, params: Dict[str, Any], request_id: Optional[str] = None) -> Dict:
     """
@@ -39,6 +105,28 @@ def format_jsonrpc_request(method: str, params: Dict[str, Any], request_id: Opti
         "id": request_id
     }
 
+def format_jsonrpc_request_bytes(method: str, params: Dict[str, Any], request_id: Optional[str] = None) -> bytes:
+    """
+    Format a JSON-RPC request directly as serialized JSON.
+    
+    Use this when the request is about to be sent: the envelope goes straight
+    to the encoder (orjson when available) without an intermediate builder call.
+    
+    Args:
+        method: Method name
+        params: Parameters
+        request_id: Request ID (generated if None)
+        
+    Returns:
+        JSON-RPC request as UTF-8 encoded bytes
+    """
+    return json_dumps({
+        "jsonrpc": JSONRPC_VERSION,
+        "method": method,
+        "params": params,
+        "id": request_id or generate_request_id()
+    })
+
 def format_jsonrpc_response(result: Any, request_id: Any) -> Dict:
     """
     Format a JSON-RPC success response.
@@ -56,6 +144,19 @@ def format_jsonrpc_response(result: Any, request_id: Any) -> Dict:
         "id": request_id
     }
 
+def format_jsonrpc_response_bytes(result_json: bytes, request_id: Any) -> bytes:
+    """
+    Format a JSON-RPC success response around an already serialized result.
+    
+    Args:
+        result_json: Response result, serialized as JSON
+        request_id: Request ID
+        
+    Returns:
+        JSON-RPC response as UTF-8 encoded bytes
+    """
+    return b'{"jsonrpc":"' + JSONRPC_VERSION.encode() + b'","result":' + result_json + b',"id":' + json_dumps(request_id) + b'}'
+
 def format_jsonrpc_error(code: int, message: str, request_id: Any, data: Optional[Any] = None) -> Dict:
     """
     Format a JSON-RPC error response.
@@ -72,8 +173,8 @@ def format_jsonrpc_error(code: int, message: str, request_id: Any, data: Optiona
     error_obj = {"code": code, "message": message}
     if data:
         try:
-            # Test if data is JSON serializable
-            json.dumps(data)
+            # Test if data is JSON serializable (orjson when available, much cheaper)
+            json_dumps(data)
             error_obj["data"] = data
         except (TypeError, OverflowError):
             error_obj["data"] = str(data)
@@ -101,7 +202,12 @@ def format_jsonrpc_notification(method: str, params: Dict) -> Dict:
         "params": params
     }
 
-def format_initialize_request(client_name: str, client_version: str = "1.0.0", protocol_version: str = "0.3.0") -> Dict:
+def format_initialize_request(
+    client_name: str,
+    client_version: str = "1.0.0",
+    protocol_version: str = "0.3.0",
+    request_id: Optional[str] = None
+) -> Dict:
     """
     Format an initialize request.
     
@@ -109,6 +215,7 @@ def format_initialize_request(client_name: str, client_version: str = "1.0.0", p
         client_name: Client name
         client_version: Client version
         protocol_version: Protocol version
+        request_id: Request ID (generated if None)
         
     Returns:
         Initialize request dictionary
@@ -123,16 +230,17 @@ def format_initialize_request(client_name: str, client_version: str = "1.0.0", p
                 "version": client_version
             }
         },
-        request_id=f"init-{generate_request_id()}"
+        request_id=request_id or f"init-{generate_request_id()}"
     )
 
-def format_tool_call_request(tool_name: str, kwargs: Dict[str, Any]) -> Dict:
+def format_tool_call_request(tool_name: str, kwargs: Dict[str, Any], request_id: Optional[str] = None) -> Dict:
     """
     Format a tool call request.
     
     Args:
         tool_name: Tool name
         kwargs: Tool parameters
+        request_id: Request ID (generated if None)
         
     Returns:
         Tool call request dictionary
@@ -143,7 +251,7 @@ def format_tool_call_request(tool_name: str, kwargs: Dict[str, Any]) -> Dict:
             "name": tool_name,
             "kwargs": kwargs
         },
-        request_id=f"call-{generate_request_id()}"
+        request_id=request_id or f"call-{generate_request_id()}"
     )
 
 def format_notification(type_name: str, message: str, data: Optional[Dict[str, Any]] = None) -> Dict:
@@ -161,7 +269,7 @@ def format_notification(type_name: str, message: str, data: Optional[Dict[str, A
     params = {
         "type": type_name,
         "message": message,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": iso_timestamp()
     }
     
     if data:
@@ -2,11 +2,28 @@
 MCP Server implementation
 """
 
-from .base import BaseMCPServer
-from .notifications import NotificationScheduler
+# BaseMCPServer and NotificationScheduler are loaded on first access (PEP 562), so
+# importing the helpers or constants below doesn't pull in FastAPI/uvicorn
+_LAZY_ATTRS = {
+    "BaseMCPServer": ".base",
+    "NotificationScheduler": ".notifications",
+}
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
 
 # For backward compatibility or direct imports
-async def push_notification(server, server_session_id, type_name, message, data=None):
+async def push_notification(server, server_session_id, type_name, message, data=None, timestamp=None):
     """
     Helper function to push a notification to a specific client via a server instance.
     
@@ -16,15 +33,17 @@ async def push_notification(server, server_session_id, type_name, message, data=
         type_name: Type of notification (info, warning, error, etc.)
         message: Notification message
         data: Optional data payload
+        timestamp: Optional ISO 8601 timestamp (defaults to now)
     """
     return await server.push_notification(
         server_session_id=server_session_id,
         type_name=type_name,
         message=message,
-        data=data
+        data=data,
+        timestamp=timestamp
     )
 
-async def broadcast_notification(server, type_name, message, data=None):
+async def broadcast_notification(server, type_name, message, data=None, body_bytes=None):
     """
     Helper function to broadcast a notification to all connected clients via a server instance.
     
@@ -33,11 +52,14 @@ async def broadcast_notification(server, type_name, message, data=None):
         type_name: Type of notification (info, warning, error, etc.)
         message: Notification message
         data: Optional data payload
+        body_bytes: Optional pre-serialized notification (e.g. from format_notification()
+                    passed through json_dumps()) reused as-is for every client
     """
     return await server.broadcast_notification(
         type_name=type_name,
         message=message,
-        data=data
+        data=data,
+        body_bytes=body_bytes
     )
 
 # Import notification types for convenience
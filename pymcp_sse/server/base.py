@@ -2,149 +2,352 @@
 Base implementation of an MCP server using FastAPI and SSE.
 """
 import asyncio
+import functools
 import inspect
-import json
-import uuid
+import logging
+from json import JSONDecodeError
+import secrets
 import os
+import time
+from collections import OrderedDict, deque
 from contextlib import asynccontextmanager
-from datetime import datetime
-from typing import Any, Dict, Optional, Callable, Awaitable, List
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Callable, Awaitable, List, Union
 
+import anyio
 import uvicorn
 from fastapi import FastAPI, Request, Response, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sse_starlette.sse import EventSourceResponse, ServerSentEvent
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from ..utils.log_setup import get_logger
+from ..utils.event_loop import uvicorn_loop_setting, uvicorn_http_setting
 from ..common.constants import *
 from ..common.utils import (
     format_jsonrpc_response,
+    format_jsonrpc_response_bytes,
     format_jsonrpc_error,
-    format_jsonrpc_notification
+    format_jsonrpc_notification,
+    iso_timestamp,
+    json_dumps,
+    json_loads
 )
 
 # Get logger
 logger = get_logger("server.base")
 
+# Max number of already-queued events written to the socket in one chunk
+_SSE_COALESCE_MAX = 32
+
+# Max number of distinct message URLs (scheme/host/root path) with a cached
+# endpoint event template
+_MAX_ENDPOINT_TEMPLATES = 16
+
+# Response headers for the /sse stream (no caching, no proxy buffering)
+_SSE_HEADERS = {
+    "Cache-Control": "no-store",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+def _encode_sse(event: str, data: Union[str, bytes]) -> bytes:
+    """
+    Frame an event in the SSE wire format.
+    
+    Args:
+        event: Event type
+        data: Event data; multi-line data is split over several `data:` fields
+        
+    Returns:
+        The complete frame, ready to be written to the stream
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if b"\n" in data or b"\r" in data:
+        data = b"\ndata: ".join(data.splitlines())
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + data + b"\n\n"
+
+# Error objects for the fixed-message JSON-RPC errors, shared by every response
+# (never mutated; responses are serialized as soon as they are built)
+_ERR_PARSE_ERROR = {"code": ERROR_PARSE_ERROR, "message": "Parse error"}
+_ERR_INVALID_REQUEST = {"code": ERROR_INVALID_REQUEST, "message": "Invalid request structure"}
+_ERR_EMPTY_BATCH = {"code": ERROR_INVALID_REQUEST, "message": "Empty batch"}
+_ERR_INVALID_SESSION = {"code": ERROR_INVALID_SESSION, "message": "Missing or invalid session ID"}
+_ERR_NOT_INITIALIZED = {"code": ERROR_SERVER_NOT_INITIALIZED, "message": "Session not initialized"}
+
+def _error_response(error: Dict[str, Any], request_id: Any) -> Dict[str, Any]:
+    """
+    Build a JSON-RPC error response around a shared error object.
+    
+    Args:
+        error: One of the module-level _ERR_* objects
+        request_id: Request ID
+        
+    Returns:
+        JSON-RPC error response dictionary
+    """
+    return {"jsonrpc": JSONRPC_VERSION, "error": error, "id": request_id}
+
+def _new_session_id() -> str:
+    """
+    Generate a random session ID.
+    
+    Returns:
+        22-character URL-safe string (128 bits from the OS CSPRNG)
+    """
+    return secrets.token_urlsafe(16)
+
+# Keep-alive frame shared by every ping; it carries no per-tick data
+_PING_FRAME = _encode_sse(EVENT_PING, "ping")
+
+def _merge_pings(batch: List[bytes]) -> List[bytes]:
+    """
+    Collapse repeated ping frames in a batch to the newest one.
+    
+    Args:
+        batch: Frames about to be written, oldest first
+        
+    Returns:
+        The batch with only its last ping frame kept
+    """
+    if batch.count(_PING_FRAME) < 2:
+        return batch
+    last = len(batch) - 1 - batch[::-1].index(_PING_FRAME)
+    return [frame for i, frame in enumerate(batch) if i == last or frame != _PING_FRAME]
+
+class _SSEResponse(StreamingResponse):
+    """
+    Streams pre-framed SSE bytes and stops as soon as the client disconnects.
+    
+    StreamingResponse only watches for disconnects on older ASGI servers; an idle
+    SSE stream would otherwise only notice a closed client on its next write.
+    """
+    media_type = "text/event-stream"
+    
+    async def __call__(self, scope, receive, send):
+        async with anyio.create_task_group() as task_group:
+            async def stream():
+                try:
+                    await self.stream_response(send)
+                except OSError:
+                    pass # Client went away mid-write
+                task_group.cancel_scope.cancel()
+                
+            task_group.start_soon(stream)
+            await self.listen_for_disconnect(receive)
+            task_group.cancel_scope.cancel()
+
 class ClientConnection:
     """Represents a single client SSE connection and its associated state."""
-    def __init__(self, client_id: str, server_session_id: str):
+    # One instance per SSE session; slots keep it small and skip the per-instance dict
+    __slots__ = (
+        "client_id", "server_session_id", "max_queue_size", "_frames", "_has_frames",
+        "_has_room", "_closed", "initialized", "connected_at", "last_heartbeat",
+        "protocol_version", "client_info",
+    )
+    
+    def __init__(self, client_id: str, server_session_id: str, max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE):
         self.client_id = client_id
         self.server_session_id = server_session_id
-        self.message_queue = asyncio.Queue()
+        # Pending SSE frames. One producer side (the server) and one consumer (the
+        # event generator), so a deque plus events replaces asyncio.Queue. Bounded
+        # so a stalled client can't grow it without limit.
+        self.max_queue_size = max_queue_size
+        self._frames: deque = deque()
+        self._has_frames = asyncio.Event()
+        self._has_room = asyncio.Event()
+        self._has_room.set()
+        self._closed = False
         self.initialized = False
-        self.connected_at = datetime.now()
+        # time.monotonic() values; see connected_at_iso for wall-clock time
+        self.connected_at = time.monotonic()
         self.last_heartbeat = self.connected_at
         self.protocol_version: Optional[str] = None
         self.client_info: Optional[Dict] = None
-        self.ping_task: Optional[asyncio.Task] = None
         logger.info(f"[{self.server_session_id}] Connection created for client {client_id}")
 
     async def send(self, event: str, data: Any):
         """Put an event onto the client's SSE queue."""
         try:
-            # Ensure data is serializable before queuing
-            if not isinstance(data, (str, bytes)):
-                payload = json.dumps(data)
-            else:
+            # Serialize (orjson when available) and frame once, before queuing
+            if isinstance(data, (str, bytes)):
                 payload = data
+            else:
+                payload = json_dumps(data)
 
-            logger.debug(f"[{self.server_session_id}] Queuing event: {event}, Data: {str(payload)[:200]}...")
-            await self.message_queue.put(ServerSentEvent(
-                event=event,
-                data=payload,
-                comment=None # Default comment to None
-            ))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[%s] Queuing event: %s, Data: %.200s...", self.server_session_id, event, payload)
+            frame = _encode_sse(event, payload)
+            if not self.offer(frame):
+                if event == EVENT_PING:
+                    logger.info(f"[{self.server_session_id}] Queue full, dropping ping event.")
+                    return
+                # Backpressure: wait for the client to drain its queue
+                await self.put(frame)
         except TypeError as e:
             logger.error(f"[{self.server_session_id}] Failed to serialize message for event '{event}': {e}")
         except Exception as e:
             logger.error(f"[{self.server_session_id}] Failed to queue message for event '{event}': {e}", exc_info=True)
 
+    def offer(self, frame: bytes) -> bool:
+        """
+        Queue a pre-framed event without waiting.
+        
+        Args:
+            frame: Encoded SSE frame
+            
+        Returns:
+            False if the queue is full (or the connection closed), True otherwise
+        """
+        if self._closed or len(self._frames) >= self.max_queue_size:
+            return False
+        self._frames.append(frame)
+        self._has_frames.set()
+        return True
+        
+    async def put(self, frame: bytes):
+        """
+        Queue a pre-framed event, waiting for room if the queue is full.
+        
+        The frame is dropped if the client disconnects while waiting.
+        
+        Args:
+            frame: Encoded SSE frame
+        """
+        while not self.offer(frame):
+            if self._closed:
+                return
+            self._has_room.clear()
+            await self._has_room.wait()
+            
+    async def next_frames(self, max_frames: int) -> List[bytes]:
+        """
+        Wait for queued frames and take up to `max_frames` of them.
+        
+        Args:
+            max_frames: Max number of frames to return
+            
+        Returns:
+            Non-empty list of frames, oldest first
+        """
+        await self._has_frames.wait()
+        frames = self._frames
+        if len(frames) <= max_frames:
+            batch = list(frames)
+            frames.clear()
+        else:
+            batch = [frames.popleft() for _ in range(max_frames)]
+        if not frames:
+            self._has_frames.clear()
+        self._has_room.set()
+        return batch
+        
+    def discard_pending(self):
+        """
+        Drop queued events after the client disconnected.
+        
+        Also wakes senders blocked on the full queue, so backpressured senders
+        don't wait forever on a dead connection.
+        """
+        self._closed = True
+        self._frames.clear()
+        self._has_room.set()
+        
+    @property
+    def connected_at_iso(self) -> str:
+        """Connection time as a local ISO 8601 timestamp (computed on demand)."""
+        elapsed = time.monotonic() - self.connected_at
+        return (datetime.now() - timedelta(seconds=elapsed)).isoformat()
+        
     def mark_initialized(self, protocol_version: str, client_info: Dict):
         """Mark the session as initialized."""
         self.initialized = True
         self.protocol_version = protocol_version
         self.client_info = client_info
         logger.info(f"[{self.server_session_id}] Session initialized. Protocol: {protocol_version}, Client: {client_info}")
-        
-    async def start_ping(self, ping_interval: int = DEFAULT_PING_INTERVAL):
-        """Start the ping task for this connection."""
-        if self.ping_task is None or self.ping_task.done():
-            logger.info(f"[{self.server_session_id}] Starting SSE ping task...")
-            try:
-                self.ping_task = asyncio.create_task(self._send_sse_ping(ping_interval))
-                # Add callback to log if task finishes unexpectedly
-                self.ping_task.add_done_callback(self._ping_task_done_callback)
-                logger.info(f"[{self.server_session_id}] Successfully created SSE ping task.")
-            except Exception as e:
-                logger.error(f"[{self.server_session_id}] Failed to create SSE ping task: {e}", exc_info=True)
-        else:
-            logger.warning(f"[{self.server_session_id}] Ping task already running.")
-            
-    def _ping_task_done_callback(self, task: asyncio.Task):
-        """Callback function to log when the ping task finishes."""
-        try:
-            # Check if the task finished with an exception
-            exception = task.exception()
-            if exception:
-                logger.error(f"[{self.server_session_id}] Ping task finished with error: {exception}", exc_info=exception)
-            else:
-                logger.info(f"[{self.server_session_id}] Ping task finished normally.")
-        except asyncio.CancelledError:
-            logger.info(f"[{self.server_session_id}] Ping task cancelled.")
-        except Exception as e:
-            logger.error(f"[{self.server_session_id}] Error in ping_task_done_callback: {e}", exc_info=True)
-
-    async def stop_ping(self):
-        """Stop the ping task for this connection."""
-        if self.ping_task and not self.ping_task.done():
-            self.ping_task.cancel()
-            try:
-                await self.ping_task
-            except asyncio.CancelledError:
-                pass
-            logger.info(f"[{self.server_session_id}] Stopped SSE ping task.")
-        self.ping_task = None
-        
-    async def _send_sse_ping(self, interval: int):
-        """Periodically sends a keep-alive ping event via the queue."""
-        logger.info(f"[{self.server_session_id}] Ping task started with {interval}s interval.")
-        ping_count = 0
-        while True:
-            try:
-                await asyncio.sleep(interval)
-                ping_count += 1
-                
-                # Send ping as a standard event
-                try:
-                    await self.send(event=EVENT_PING, data=str(ping_count))
-                    logger.debug(f"[{self.server_session_id}] Sent SSE ping event #{ping_count}.")
-                except Exception as send_err:
-                    logger.error(f"[{self.server_session_id}] Error sending ping event #{ping_count}: {send_err}", exc_info=True)
-                    
-            except asyncio.CancelledError:
-                logger.debug(f"[{self.server_session_id}] SSE ping task cancelled.")
-                break
-            except Exception as e:
-                logger.error(f"[{self.server_session_id}] Error in SSE ping task: {e}", exc_info=True)
-                break  # Stop task on unexpected error
 
 class BaseMCPServer:
     """Base MCP Server implementation using FastAPI and SSE for transport."""
     
-    def __init__(self, server_name: str = "MCP Server", ping_interval: int = DEFAULT_PING_INTERVAL):
+    def __init__(
+        self,
+        server_name: str = "MCP Server",
+        ping_interval: int = DEFAULT_PING_INTERVAL,
+        result_cache_size: int = 256,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_concurrent_requests: Optional[int] = None,
+        max_request_bytes: int = 4 * 1024 * 1024,
+        shutdown_timeout: Optional[float] = 10.0,
+        broadcast_timeout: Optional[float] = 5.0
+    ):
         """
         Initialize the MCP server.
         
         Args:
             server_name: Name of the server (shown in logs and health endpoint)
             ping_interval: Interval in seconds for sending ping events to clients
+            result_cache_size: Max number of serialized results kept for tools
+                               registered with cacheable=True
+            max_queue_size: Max number of events queued per client before senders
+                            wait (pings are dropped instead)
+            max_concurrent_requests: Max number of /messages requests (tool calls
+                                     included) processed at once; each request in a
+                                     JSON-RPC batch takes its own slot. Further
+                                     requests wait for a free slot. Defaults to the
+                                     MCP_MAX_INFLIGHT environment variable, else 256
+            max_request_bytes: Max size of a /messages request body; larger
+                               requests are rejected with 413
+            shutdown_timeout: Seconds run_with_tasks waits for shutdown callbacks,
+                              and then for cancelled tasks, before giving up on
+                              them (None waits indefinitely)
+            broadcast_timeout: Seconds a broadcast waits for clients with a full
+                               queue before dropping the notification for them
+                               (None waits indefinitely)
         """
         self.server_name = server_name
         self.ping_interval = ping_interval
+        self.max_queue_size = max_queue_size
         self.active_connections: Dict[str, ClientConnection] = {}
         self.tool_registry: Dict[str, Callable] = {}
+        # LRU of serialized results for cacheable tools: (tool_name, kwargs) -> JSON bytes
+        self.result_cache_size = result_cache_size
+        self._result_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._cacheable_tools: set = set()
+        # describe_tools details per tool, built once at registration
+        self._tool_meta: Dict[str, Dict[str, Any]] = {}
+        # Tools whose signature accepts server_session_id (checked once at registration)
+        self._session_tools: set = set()
+        # Tools registered as plain functions; they run in the default executor
+        self._sync_tools: set = set()
+        # Admission control for /messages (resizable via set_concurrency())
+        if max_concurrent_requests is None:
+            max_concurrent_requests = 256
+            env_inflight_str = os.environ.get("MCP_MAX_INFLIGHT")
+            if env_inflight_str:
+                try:
+                    max_concurrent_requests = max(1, int(env_inflight_str))
+                except ValueError:
+                    logger.warning(f"Invalid MCP_MAX_INFLIGHT environment variable '{env_inflight_str}'. Using default limit {max_concurrent_requests}.")
+        self.max_concurrent_requests = max_concurrent_requests
+        self.max_request_bytes = max_request_bytes
+        self.shutdown_timeout = shutdown_timeout
+        self.broadcast_timeout = broadcast_timeout
+        self._inflight = 0
+        self._inflight_cond = asyncio.Condition()
+        # JSON-RPC method -> (handler, requires an initialized session)
+        self._method_dispatch: Dict[str, tuple] = {
+            METHOD_INITIALIZE: (self._handle_initialize, False),
+            METHOD_TOOL_CALL: (self._handle_tool_call, True),
+        }
+        self._unknown_method_entry = (self._handle_unknown_method, True)
+        # Path of the /messages route, resolved when the first endpoint template is built
+        self._message_path: Optional[str] = None
+        # Pre-encoded endpoint event pieces per (scheme, host, root path) (see _build_endpoint_template)
+        self._endpoint_templates: Dict[tuple, tuple] = {}
+        # One ping task for all connections (started with the first SSE client)
+        self._ping_task: Optional[asyncio.Task] = None
+        self._ping_count = 0
         
         # Create FastAPI app
         self.app = self._create_app()
@@ -163,9 +366,8 @@ class BaseMCPServer:
             logger.info(f"Server '{self.server_name}' starting up...")
             yield
             logger.info(f"Server '{self.server_name}' shutting down...")
-            # Gracefully stop pings for any remaining connections
-            for conn in list(self.active_connections.values()):
-                await conn.stop_ping()
+            # Stop the shared ping task
+            await self._stop_pinger()
             self.active_connections.clear()
             
         app = FastAPI(title=self.server_name, lifespan=lifespan_manager)
@@ -179,175 +381,226 @@ class BaseMCPServer:
             allow_headers=["*"],
         )
         
+        @app.exception_handler(StarletteHTTPException)
+        async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+            """Render HTTP errors (e.g. JSON-RPC error details) with json_dumps."""
+            headers = getattr(exc, "headers", None)
+            if exc.status_code < 200 or exc.status_code in (204, 304):
+                return Response(status_code=exc.status_code, headers=headers)
+            return Response(
+                json_dumps({"detail": exc.detail}),
+                status_code=exc.status_code,
+                headers=headers,
+                media_type="application/json"
+            )
+            
         @app.get("/health", name="health_endpoint")
         async def health():
             """Health check endpoint."""
-            return {
+            # Serialized directly; skips FastAPI's jsonable_encoder pass
+            return Response(json_dumps({
                 "status": "ok",
                 "service": self.server_name,
                 "active_sessions": len(self.active_connections),
                 "available_tools": list(self.tool_registry.keys())
-            }
+            }), media_type="application/json")
             
         @app.get("/sse")
         async def sse_endpoint(request: Request):
             """Handles client SSE connections."""
             client_id = request.query_params.get("client_id")
             if not client_id:
-                client_id = str(uuid.uuid4())
+                client_id = _new_session_id()
                 logger.info(f"Client connected without client_id, generated: {client_id}")
                 
-            server_session_id = str(uuid.uuid4())
-            connection = ClientConnection(client_id, server_session_id)
+            server_session_id = _new_session_id()
+            connection = ClientConnection(client_id, server_session_id, self.max_queue_size)
             self.active_connections[server_session_id] = connection
             
             logger.info(f"[{server_session_id}] Client {client_id} connected. Total clients: {len(self.active_connections)}")
             
-            # Define the message endpoint URL for this session
-            base_url = str(request.url_for('message_endpoint'))
-            # Ensure scheme matches the incoming request
-            if request.url.scheme == "https":
-                message_url = base_url.replace("http://", "https://", 1)
+            # Initial event with endpoint info. Session IDs are URL-safe and the frame
+            # around them is the same for every client reaching the server the same
+            # way, so it is built once per (scheme, host, root path) and reused; the
+            # scheme already reflects X-Forwarded-Proto from trusted proxies (uvicorn's
+            # proxy_headers). Cache hits skip building the URL and the route lookup.
+            scope = request.scope
+            template_key = (scope["scheme"], request.headers.get("host"), scope.get("root_path", ""))
+            template = self._endpoint_templates.get(template_key)
+            if template is None:
+                if self._message_path is None:
+                    self._message_path = app.url_path_for('message_endpoint')
+                url = request.url
+                message_url = f"{url.scheme}://{url.netloc}{template_key[2]}{self._message_path}"
+                template = self._build_endpoint_template(template_key, message_url)
+            if template is not None:
+                sid = server_session_id.encode("ascii")
+                initial_frame = template[0] + sid + template[1] + sid + template[2]
             else:
-                message_url = base_url
-                
-            # Append session ID
-            message_url_with_session = f"{message_url}?session_id={server_session_id}"
-            
-            # Initial event with endpoint info
-            initial_event = ServerSentEvent(
-                event=EVENT_ENDPOINT,
-                data=json.dumps({
-                    "endpoint": message_url_with_session,
+                initial_frame = _encode_sse(EVENT_ENDPOINT, json_dumps({
+                    "endpoint": f"{message_url}?session_id={server_session_id}",
                     "server_session_id": server_session_id
-                })
-            )
+                }))
             
-            # Start ping task for this connection
-            await connection.start_ping(self.ping_interval)
+            # Make sure the shared ping task is running
+            self._ensure_pinger()
             
             async def event_generator():
                 """Yields events: endpoint info, messages from queue."""
-                yield initial_event
+                yield initial_frame
                 try:
                     while True:
-                        # Wait for message from the queue
-                        message = await connection.message_queue.get()
-                        logger.debug(f"[{server_session_id}] Yielding SSE event: {message.event}")
-                        yield message
-                        connection.message_queue.task_done()
+                        # Wait for pre-framed events; a burst is drained in one wakeup
+                        # and coalesced into a single write
+                        batch = await connection.next_frames(_SSE_COALESCE_MAX)
+                        if len(batch) > 1:
+                            # Pings are idempotent; a backlog only needs one
+                            batch = _merge_pings(batch)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("[%s] Yielding %d SSE frames", server_session_id, len(batch))
+                        yield batch[0] if len(batch) == 1 else b"".join(batch)
                 except asyncio.CancelledError:
                     logger.info(f"[{server_session_id}] Event generator cancelled.")
+                    raise
                 finally:
                     logger.info(f"[{server_session_id}] Cleaning up SSE connection.")
-                    await connection.stop_ping()
                     if server_session_id in self.active_connections:
                         del self.active_connections[server_session_id]
+                    connection.discard_pending()
                     logger.info(f"[{self.server_name} / {server_session_id}] Client {client_id} disconnected. Total clients: {len(self.active_connections)}")
             
-            return EventSourceResponse(event_generator(), ping=self.ping_interval)
+            return _SSEResponse(event_generator(), headers=_SSE_HEADERS)
+            
+        async def handle_request(body: Any, connection: Optional[ClientConnection], server_session_id: Optional[str]):
+            """
+            Validate and dispatch a single JSON-RPC request.
+            
+            Responses are delivered over the client's SSE stream. Raises HTTPException
+            for requests that cannot be answered over SSE.
+            """
+            # Basic JSON-RPC validation
+            if not isinstance(body, dict) or body.get("jsonrpc") != JSONRPC_VERSION or "method" not in body:
+                err = _error_response(_ERR_INVALID_REQUEST, body.get("id") if isinstance(body, dict) else None)
+                raise HTTPException(status_code=400, detail=err)
+                    
+            method = body["method"]
+            params = body.get("params", {})
+            request_id = body.get("id")
+            handler, requires_init = self._method_dispatch.get(method, self._unknown_method_entry)
+            
+            # --- Validate session ---
+            if not connection:
+                logger.warning(f"Request '{method}' received without valid session: {server_session_id}")
+                err = _error_response(_ERR_INVALID_SESSION, request_id)
+                raise HTTPException(status_code=400, detail=err)
+                    
+            if requires_init and not connection.initialized:
+                logger.warning(f"[{server_session_id}] Received '{method}' before initialization.")
+                error_response = _error_response(_ERR_NOT_INITIALIZED, request_id)
+                await connection.send(EVENT_MESSAGE, error_response)
+                return
+                
+            await handler(connection, method, params, request_id)
+            
+        async def handle_batch(batch: List[Any], connection: Optional[ClientConnection], server_session_id: Optional[str]):
+            """
+            Dispatch a JSON-RPC batch (array of requests) concurrently.
+            
+            Each request is answered individually over SSE, keyed by its own id,
+            and takes its own processing slot while it runs.
+            """
+            if not batch:
+                err = _error_response(_ERR_EMPTY_BATCH, None)
+                raise HTTPException(status_code=400, detail=err)
+                
+            if not connection:
+                logger.warning(f"Batch request received without valid session: {server_session_id}")
+                err = _error_response(_ERR_INVALID_SESSION, None)
+                raise HTTPException(status_code=400, detail=err)
+                
+            async def handle_item(item: Any):
+                await self._acquire_request_slot()
+                try:
+                    await handle_request(item, connection, server_session_id)
+                finally:
+                    await self._release_request_slot()
+                    
+            results = await asyncio.gather(*(handle_item(item) for item in batch), return_exceptions=True)
+            
+            # Report per-request failures over SSE instead of failing the whole batch
+            for item, result in zip(batch, results):
+                if not isinstance(result, Exception):
+                    continue
+                if isinstance(result, HTTPException) and isinstance(result.detail, dict):
+                    error_response = result.detail
+                else:
+                    logger.error(f"[{server_session_id}] Error processing batch request: {result}")
+                    item_id = item.get("id") if isinstance(item, dict) else None
+                    error_response = format_jsonrpc_error(ERROR_INTERNAL_ERROR, f"Internal error: {str(result)}", item_id)
+                await connection.send(EVENT_MESSAGE, error_response)
+
+        async def read_body(request: Request, enforce_limit: bool) -> bytes:
+            """
+            Read the request body.
+            
+            Bodies without a Content-Length (chunked) are read incrementally and
+            rejected with 413 as soon as they exceed max_request_bytes.
+            """
+            if not enforce_limit:
+                return await request.body()
+                
+            chunks = []
+            size = 0
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > self.max_request_bytes:
+                    raise HTTPException(status_code=413, detail="Request body too large")
+                chunks.append(chunk)
+            return b"".join(chunks)
             
         @app.post("/messages", name="message_endpoint")
         async def message_endpoint(request: Request):
             """Handles incoming JSON-RPC requests."""
             server_session_id = request.query_params.get("session_id")
             request_id = None
-            connection: Optional[ClientConnection] = None
             
-            # Get connection if possible
-            if server_session_id and server_session_id in self.active_connections:
-                connection = self.active_connections[server_session_id]
+            # Get connection if possible (single lookup)
+            connection: Optional[ClientConnection] = (
+                self.active_connections.get(server_session_id) if server_session_id else None
+            )
                 
-            try:
-                body = await request.json()
-                log_session = server_session_id or 'NO_SESSION'
-                logger.debug(f"[{log_session}] Received request: {body}")
+            # Reject oversized bodies before reading them
+            content_length = request.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > self.max_request_bytes:
+                raise HTTPException(status_code=413, detail="Request body too large")
                 
-                # Basic JSON-RPC validation
-                if not isinstance(body, dict) or body.get("jsonrpc") != JSONRPC_VERSION or "method" not in body:
-                    err = format_jsonrpc_error(ERROR_INVALID_REQUEST, "Invalid request structure", body.get("id"))
-                    raise HTTPException(status_code=400, detail=err)
-                    
-                method = body["method"]
-                params = body.get("params", {})
-                request_id = body.get("id")
+            # Wait for a processing slot
+            await self._acquire_request_slot()
+            holds_slot = True
                 
-                # --- Initialization ---
-                if method == METHOD_INITIALIZE:
-                    if not connection:
-                        logger.error(f"Initialize received for unknown session ID: {server_session_id}")
-                        err = format_jsonrpc_error(ERROR_INVALID_SESSION, "Invalid session ID", request_id)
-                        raise HTTPException(status_code=400, detail=err)
-                        
-                    if connection.initialized:
-                        logger.warning(f"[{server_session_id}] Session already initialized.")
-                    else:
-                        protocol_version = params.get("protocolVersion", "unknown")
-                        client_info = params.get("clientInfo", {})
-                        connection.mark_initialized(protocol_version, client_info)
-                        
-                    # Send success response with available tools
-                    response_data = {"capabilities": {"tools": list(self.tool_registry.keys())}}
-                    response = format_jsonrpc_response(response_data, request_id)
-                    await connection.send(EVENT_MESSAGE, response)
-                    return Response(status_code=202)  # Accepted, response via SSE
-                    
-                # --- Validate session for other requests ---
-                if not connection:
-                    logger.warning(f"Request '{method}' received without valid session: {server_session_id}")
-                    err = format_jsonrpc_error(ERROR_INVALID_SESSION, "Missing or invalid session ID", request_id)
-                    raise HTTPException(status_code=400, detail=err)
-                    
-                if not connection.initialized:
-                    logger.warning(f"[{server_session_id}] Received '{method}' before initialization.")
-                    error_response = format_jsonrpc_error(ERROR_SERVER_NOT_INITIALIZED, "Session not initialized", request_id)
-                    await connection.send(EVENT_MESSAGE, error_response)
-                    return Response(status_code=202)
-                    
-                # --- Tool Call ---
-                if method == METHOD_TOOL_CALL:
-                    tool_name = params.get("name")
-                    tool_kwargs = params.get("kwargs", {})
-                    logger.info(f"[{server_session_id}] Processing tool call '{tool_name}' with args: {tool_kwargs}")
-                    
-                    if not tool_name or tool_name not in self.tool_registry:
-                        error_response = format_jsonrpc_error(
-                            ERROR_TOOL_NOT_FOUND, 
-                            f"Tool not found: {tool_name}", 
-                            request_id
-                        )
-                        await connection.send(EVENT_MESSAGE, error_response)
-                        return Response(status_code=202)
-                        
-                    try:
-                        tool_func = self.tool_registry[tool_name]
-                        # Inject session ID if tool accepts it
-                        if "server_session_id" in inspect.signature(tool_func).parameters:
-                            tool_kwargs["server_session_id"] = server_session_id
-                            
-                        result = await tool_func(**tool_kwargs)
-                        success_response = format_jsonrpc_response(result, request_id)
-                        await connection.send(EVENT_MESSAGE, success_response)
-                    except Exception as e:
-                        logger.error(f"[{server_session_id}] Error executing tool '{tool_name}': {e}", exc_info=True)
-                        error_response = format_jsonrpc_error(
-                            ERROR_TOOL_EXECUTION_ERROR,
-                            f"Tool execution error: {str(e)}",
-                            request_id
-                        )
-                        await connection.send(EVENT_MESSAGE, error_response)
-                        
-                    return Response(status_code=202)
+            try:
+                raw_body = await read_body(request, content_length is None)
+                try:
+                    body = json_loads(raw_body) # orjson when available
+                except JSONDecodeError as e:
+                    # orjson's decode error subclasses the stdlib one
+                    logger.warning(f"[{server_session_id or 'UNKNOWN'}] Invalid JSON in request body: {e}")
+                    raise HTTPException(status_code=400, detail=_error_response(_ERR_PARSE_ERROR, None))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[%s] Received request: %s", server_session_id or 'NO_SESSION', body)
+                
+                if isinstance(body, list):
+                    # Batch items take their own slots; holding this one as well
+                    # could deadlock concurrent batches
+                    await self._release_request_slot()
+                    holds_slot = False
+                    await handle_batch(body, connection, server_session_id)
+                    return Response(status_code=202)  # Accepted, responses via SSE
                     
-                # --- Unknown Method ---
-                logger.warning(f"[{server_session_id}] Unknown method: {method}")
-                error_response = format_jsonrpc_error(
-                    ERROR_METHOD_NOT_FOUND,
-                    f"Method not found: {method}",
-                    request_id
-                )
-                await connection.send(EVENT_MESSAGE, error_response)
-                return Response(status_code=202)
+                if isinstance(body, dict):
+                    request_id = body.get("id")
+                await handle_request(body, connection, server_session_id)
+                return Response(status_code=202)  # Accepted, response via SSE
                 
             except HTTPException:
                 # Re-raise HTTP exceptions
@@ -368,12 +621,176 @@ class BaseMCPServer:
                         
                 # Fallback to HTTP error
                 raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+            finally:
+                if holds_slot:
+                    await self._release_request_slot()
         
         # Hook for custom routes
         self._add_custom_routes(app)
                 
         return app
     
+    def _build_endpoint_template(self, key: tuple, message_url: str) -> Optional[tuple]:
+        """
+        Pre-encode the endpoint event for a message URL, minus the session ID.
+        
+        Args:
+            key: Cache key (scheme, Host header, root path) the URL was built from
+            message_url: Absolute URL of the message endpoint
+            
+        Returns:
+            (head, middle, tail) bytes to join around the session ID, or None if
+            the URL needs JSON escaping and must go through the encoder
+        """
+        if any(c in '"\\' or c < " " for c in message_url):
+            return None
+        frame = _encode_sse(
+            EVENT_ENDPOINT,
+            f'{{"endpoint":"{message_url}?session_id=\0","server_session_id":"\0"}}'
+        )
+        template = tuple(frame.split(b"\0"))
+        # The host part comes from the request; don't let odd Host headers grow this
+        if len(self._endpoint_templates) < _MAX_ENDPOINT_TEMPLATES:
+            self._endpoint_templates[key] = template
+        return template
+        
+    async def _acquire_request_slot(self):
+        """Wait for a free /messages processing slot and take it."""
+        async with self._inflight_cond:
+            await self._inflight_cond.wait_for(lambda: self._inflight < self.max_concurrent_requests)
+            self._inflight += 1
+            
+    async def _release_request_slot(self):
+        """Return a processing slot and wake one waiter."""
+        async with self._inflight_cond:
+            self._inflight -= 1
+            self._inflight_cond.notify(1)
+            
+    async def set_concurrency(self, max_concurrent_requests: int):
+        """
+        Change the maximum number of /messages requests processed at once.
+        
+        Args:
+            max_concurrent_requests: New limit (must be at least 1)
+        """
+        if max_concurrent_requests < 1:
+            raise ValueError("max_concurrent_requests must be at least 1")
+            
+        async with self._inflight_cond:
+            grown = max_concurrent_requests > self.max_concurrent_requests
+            self.max_concurrent_requests = max_concurrent_requests
+            if grown:
+                # Wake every waiter so the newly available slots are filled
+                self._inflight_cond.notify_all()
+        logger.info(f"[{self.server_name}] Max concurrent requests set to {max_concurrent_requests}")
+        
+    def _ensure_pinger(self):
+        """Start the shared ping task if it is not running."""
+        if self._ping_task is None or self._ping_task.done():
+            logger.info(f"[{self.server_name}] Starting SSE ping task ({self.ping_interval}s interval)")
+            self._ping_task = asyncio.create_task(self._ping_loop(), name="mcp_sse_pinger")
+            
+    async def _stop_pinger(self):
+        """Cancel the shared ping task."""
+        if self._ping_task and not self._ping_task.done():
+            self._ping_task.cancel()
+            try:
+                await self._ping_task
+            except asyncio.CancelledError:
+                pass
+            logger.info(f"[{self.server_name}] Stopped SSE ping task.")
+        self._ping_task = None
+        
+    async def _ping_loop(self):
+        """
+        Periodically queue a keep-alive ping event for every connected client.
+        
+        A single timer serves all connections; the task exits once no clients
+        remain and is restarted by the next SSE connection.
+        """
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            if not self.active_connections:
+                logger.info(f"[{self.server_name}] No SSE clients left, ping task exiting.")
+                return
+                
+            self._ping_count += 1 # Only used for logging
+            # No awaits in this loop, so the dict can be iterated without a copy
+            now = time.monotonic()
+            for connection in self.active_connections.values():
+                connection.last_heartbeat = now
+                if not connection.offer(_PING_FRAME):
+                    # The client has plenty of unread events; a ping adds nothing
+                    logger.info(f"[{connection.server_session_id}] Queue full, dropping ping event.")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[%s] Sent SSE ping #%d to %d clients.", self.server_name, self._ping_count, len(self.active_connections))
+            
+    async def _handle_initialize(self, connection: ClientConnection, method: str, params: Dict[str, Any], request_id: Any):
+        """Handle the `initialize` request: mark the session and report the available tools."""
+        if connection.initialized:
+            logger.warning(f"[{connection.server_session_id}] Session already initialized.")
+        else:
+            protocol_version = params.get("protocolVersion", "unknown")
+            client_info = params.get("clientInfo", {})
+            connection.mark_initialized(protocol_version, client_info)
+                
+        # Send success response with available tools
+        response_data = {"capabilities": {"tools": list(self.tool_registry.keys())}}
+        response = format_jsonrpc_response(response_data, request_id)
+        await connection.send(EVENT_MESSAGE, response)
+        
+    async def _handle_tool_call(self, connection: ClientConnection, method: str, params: Dict[str, Any], request_id: Any):
+        """Handle a `tools/call` request: run the tool and send its result or error."""
+        server_session_id = connection.server_session_id
+        tool_name = params.get("name")
+        tool_kwargs = params.get("kwargs", {})
+        logger.info(f"[{server_session_id}] Processing tool call '{tool_name}' with args: {tool_kwargs}")
+            
+        tool_func = self.tool_registry.get(tool_name) if tool_name else None
+        if tool_func is None:
+            error_response = format_jsonrpc_error(
+                ERROR_TOOL_NOT_FOUND, 
+                f"Tool not found: {tool_name}", 
+                request_id
+            )
+            await connection.send(EVENT_MESSAGE, error_response)
+            return
+                
+        try:
+            # Inject session ID if tool accepts it
+            if tool_name in self._session_tools:
+                tool_kwargs["server_session_id"] = server_session_id
+                
+            if tool_name in self._cacheable_tools:
+                result_json = await self._call_cacheable_tool(tool_name, tool_func, tool_kwargs)
+                await connection.send(EVENT_MESSAGE, format_jsonrpc_response_bytes(result_json, request_id))
+                return
+                    
+            if tool_name in self._sync_tools:
+                result = await self._run_sync_tool(tool_func, tool_kwargs)
+            else:
+                result = await tool_func(**tool_kwargs)
+            success_response = format_jsonrpc_response(result, request_id)
+            await connection.send(EVENT_MESSAGE, success_response)
+        except Exception as e:
+            logger.error(f"[{server_session_id}] Error executing tool '{tool_name}': {e}", exc_info=True)
+            error_response = format_jsonrpc_error(
+                ERROR_TOOL_EXECUTION_ERROR,
+                f"Tool execution error: {str(e)}",
+                request_id
+            )
+            await connection.send(EVENT_MESSAGE, error_response)
+            
+    async def _handle_unknown_method(self, connection: ClientConnection, method: str, params: Dict[str, Any], request_id: Any):
+        """Answer a request for a method the server doesn't implement."""
+        logger.warning(f"[{connection.server_session_id}] Unknown method: {method}")
+        error_response = format_jsonrpc_error(
+            ERROR_METHOD_NOT_FOUND,
+            f"Method not found: {method}",
+            request_id
+        )
+        await connection.send(EVENT_MESSAGE, error_response)
+        
     def _add_custom_routes(self, app: FastAPI):
         """
         Hook for adding custom routes to the FastAPI app.
@@ -385,17 +802,20 @@ class BaseMCPServer:
         """
         pass
     
-    def register_tool(self, name: str = None):
+    def register_tool(self, name: str = None, cacheable: bool = False):
         """
         Decorator to register a tool function.
         
         Args:
             name: Tool name (uses function name if None)
+            cacheable: If True, the tool's result depends only on its arguments;
+                       serialized results are cached and repeated calls skip the tool
             
         Returns:
-            Decorator function
+            Decorator function. Plain (non-async) functions are run in the default
+            thread pool so blocking work doesn't stall the event loop.
         """
-        def decorator(func: Callable[..., Awaitable[Any]]):
+        def decorator(func: Callable[..., Any]):
             tool_name = name or func.__name__
             logger.info(f"[{self.server_name}] Registering tool: {tool_name}")
             
@@ -403,10 +823,87 @@ class BaseMCPServer:
                 logger.warning(f"[{self.server_name}] Tool '{tool_name}' is being overwritten.")
                 
             self.tool_registry[tool_name] = func
+            self._tool_meta[tool_name] = self._build_tool_meta(tool_name, func)
+            # Drop results cached for a previous registration under this name
+            for key in [key for key in self._result_cache if key[0] == tool_name]:
+                del self._result_cache[key]
+            if cacheable:
+                self._cacheable_tools.add(tool_name)
+            else:
+                self._cacheable_tools.discard(tool_name)
+            if "server_session_id" in inspect.signature(func).parameters:
+                self._session_tools.add(tool_name)
+            else:
+                self._session_tools.discard(tool_name)
+            if inspect.iscoroutinefunction(func):
+                self._sync_tools.discard(tool_name)
+            else:
+                self._sync_tools.add(tool_name)
             return func
         return decorator
         
-    async def push_notification(self, server_session_id: str, type_name: str, message: str, data: Optional[Dict] = None):
+    async def _run_sync_tool(self, tool_func: Callable, tool_kwargs: Dict[str, Any]) -> Any:
+        """
+        Run a non-async tool in the default thread pool.
+        
+        Args:
+            tool_func: Registered tool function
+            tool_kwargs: Call arguments
+            
+        Returns:
+            The tool result
+        """
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, functools.partial(tool_func, **tool_kwargs))
+        # Callables that aren't coroutine functions may still return an awaitable
+        # (e.g. functools.partial of an async function)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+        
+    async def _call_cacheable_tool(self, tool_name: str, tool_func: Callable, tool_kwargs: Dict[str, Any]) -> bytes:
+        """
+        Run a cacheable tool, reusing the serialized result of an earlier identical call.
+        
+        Args:
+            tool_name: Tool name
+            tool_func: Registered tool function
+            tool_kwargs: Call arguments
+            
+        Returns:
+            The tool result serialized as JSON
+        """
+        try:
+            key = (tool_name, tuple(sorted(tool_kwargs.items())))
+            hash(key)
+        except TypeError:
+            # Unhashable arguments (lists, dicts): not cached
+            if tool_name in self._sync_tools:
+                return json_dumps(await self._run_sync_tool(tool_func, tool_kwargs))
+            return json_dumps(await tool_func(**tool_kwargs))
+            
+        result_json = self._result_cache.get(key)
+        if result_json is not None:
+            self._result_cache.move_to_end(key)
+            return result_json
+            
+        if tool_name in self._sync_tools:
+            result_json = json_dumps(await self._run_sync_tool(tool_func, tool_kwargs))
+        else:
+            result_json = json_dumps(await tool_func(**tool_kwargs))
+        self._result_cache[key] = result_json
+        if len(self._result_cache) > self.result_cache_size:
+            self._result_cache.popitem(last=False)
+        return result_json
+        
+    async def push_notification(
+        self,
+        server_session_id: str,
+        type_name: str,
+        message: str,
+        data: Optional[Dict] = None,
+        timestamp: Optional[str] = None
+    ):
         """
         Send a notification to a specific client.
         
@@ -415,13 +912,15 @@ class BaseMCPServer:
             type_name: Notification type (info, warning, error, data)
             message: Notification message
             data: Optional additional data
+            timestamp: Optional ISO 8601 timestamp to send, e.g. one shared by
+                       several related notifications (defaults to now)
         """
         connection = self.active_connections.get(server_session_id)
         if connection:
             notification_params = {
                 "type": type_name,
                 "message": message,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp or iso_timestamp()
             }
             if data:
                 notification_params["data"] = data
@@ -432,14 +931,29 @@ class BaseMCPServer:
         else:
             logger.warning(f"Notification attempted for non-existent session: {server_session_id}")
     
-    async def broadcast_notification(self, type_name: str, message: str, data: Optional[Dict] = None):
+    async def broadcast_notification(
+        self,
+        type_name: str,
+        message: str,
+        data: Optional[Dict] = None,
+        body_bytes: Optional[bytes] = None,
+        timestamp: Optional[str] = None
+    ):
         """
         Send a notification to all connected clients.
         
+        The notification is serialized and framed once and the same frame is
+        queued for every client in a single pass. Clients whose queue stays full
+        for `broadcast_timeout` seconds miss the notification, so one stalled
+        client cannot hold up the broadcast for everyone else.
+        
         Args:
             type_name: Notification type (info, warning, error, data)
             message: Notification message
             data: Optional additional data
+            body_bytes: Optional pre-serialized JSON-RPC notification; when given,
+                        type_name/message/data are only used for logging
+            timestamp: Optional ISO 8601 timestamp to send (defaults to now)
         """
         if not self.active_connections:
             logger.info(f"No active connections for broadcast notification: {message}")
@@ -447,13 +961,52 @@ class BaseMCPServer:
             
         logger.info(f"Broadcasting {type_name} notification to {len(self.active_connections)} clients: {message}")
         
-        for session_id in list(self.active_connections.keys()):
-            try:
-                await self.push_notification(session_id, type_name, message, data)
-            except Exception as e:
-                logger.error(f"Error sending notification to {session_id}: {e}")
+        if body_bytes is None:
+            notification_params = {
+                "type": type_name,
+                "message": message,
+                "timestamp": timestamp or iso_timestamp()
+            }
+            if data:
+                notification_params["data"] = data
+            body_bytes = json_dumps(format_jsonrpc_notification(METHOD_NOTIFICATION, notification_params))
+        
+        # One frame shared by every queue; nothing here awaits, so the
+        # connection set cannot change mid-loop
+        frame = _encode_sse(EVENT_MESSAGE, body_bytes)
+        blocked = []
+        try:
+            for connection in self.active_connections.values():
+                if not connection.offer(frame):
+                    blocked.append(connection)
+                    
+            # Clients with a full queue apply backpressure, up to broadcast_timeout
+            if blocked:
+                logger.info(f"Broadcast waiting on {len(blocked)} clients with full queues")
+                puts = {asyncio.ensure_future(connection.put(frame)): connection for connection in blocked}
+                try:
+                    done, pending = await asyncio.wait(puts, timeout=self.broadcast_timeout)
+                except asyncio.CancelledError:
+                    for task in puts:
+                        task.cancel()
+                    raise
+                for task in pending:
+                    task.cancel()
+                    logger.warning(f"[{puts[task].server_session_id}] Queue still full after {self.broadcast_timeout}s, dropping broadcast notification")
+                for task in done:
+                    if task.exception() is not None:
+                        logger.error(f"[{puts[task].server_session_id}] Failed to queue broadcast notification: {task.exception()}")
+        except Exception as e:
+            logger.error(f"Error broadcasting notification: {e}", exc_info=True)
     
-    def run(self, host: Optional[str] = None, port: Optional[int] = None, **kwargs):
+    def run(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        workers: Optional[int] = None,
+        app_import: Optional[str] = None,
+        **kwargs
+    ):
         """
         Run the server using uvicorn.
 
@@ -462,7 +1015,17 @@ class BaseMCPServer:
                   variable, otherwise defaults to "0.0.0.0".
             port: Port to listen on. If None, checks the MCP_PORT environment
                   variable, otherwise defaults to 8000.
-            **kwargs: Additional arguments passed to uvicorn.run
+            workers: Number of worker processes. If None, checks the MCP_WORKERS
+                     environment variable, otherwise defaults to 1. Each worker has
+                     its own active_connections, so broadcasts only reach that
+                     worker's clients.
+            app_import: Import string for the app, e.g. "main:server.app". Required
+                        by uvicorn when workers > 1; falls back to MCP_APP.
+            **kwargs: Additional arguments passed to uvicorn.run. `loop` defaults
+                      to "uvloop" and `http` to "httptools" when they are installed
+                      (pip install pymcp-sse[speedups]); `log_config` defaults to
+                      None so uvicorn logs through the existing logging setup, and
+                      `log_level` to "info".
         """
         # Determine host and port
         final_host = host or os.environ.get("MCP_HOST") or "0.0.0.0"
@@ -477,75 +1040,113 @@ class BaseMCPServer:
                 except ValueError:
                     logger.warning(f"Invalid MCP_PORT environment variable '{env_port_str}'. Using default port {final_port}.")
 
+        # Determine worker count
+        final_workers = 1
+        if workers is not None:
+            final_workers = workers
+        else:
+            env_workers_str = os.environ.get("MCP_WORKERS")
+            if env_workers_str:
+                try:
+                    final_workers = int(env_workers_str)
+                except ValueError:
+                    logger.warning(f"Invalid MCP_WORKERS environment variable '{env_workers_str}'. Using a single worker.")
+
+        kwargs.setdefault("loop", uvicorn_loop_setting())
+        kwargs.setdefault("http", uvicorn_http_setting())
+        
+        app: Any = self.app
+        if final_workers > 1:
+            # uvicorn imports the app in each worker process, so it needs an import string
+            app_import = app_import or os.environ.get("MCP_APP")
+            if app_import:
+                app = app_import
+                kwargs["workers"] = final_workers
+            else:
+                logger.warning(f"{final_workers} workers requested but no app_import/MCP_APP given. Running a single worker.")
+                final_workers = 1
+
+        # uvicorn's loggers propagate to the logging set up by configure_logging()
+        # instead of uvicorn installing its own dictConfig; log_level keeps the
+        # startup and access logs visible despite configure_logging()'s WARNING default
+        kwargs.setdefault("log_config", None)
+        kwargs.setdefault("log_level", "info")
+
         # Use determined host/port in log message and uvicorn.run
-        logger.info(f"Starting {self.server_name} on {final_host}:{final_port}")
-        uvicorn.run(self.app, host=final_host, port=final_port, **kwargs)
+        logger.info(f"Starting {self.server_name} on {final_host}:{final_port} ({final_workers} worker(s))")
+        uvicorn.run(app, host=final_host, port=final_port, **kwargs)
 
     async def _describe_tools(self) -> Dict[str, Dict[str, Any]]:
         """
         Return detailed information about all available tools, including parameters and docstrings.
         
+        Tool details are computed once at registration (see _build_tool_meta).
+        
         Returns:
             Dict: A dictionary mapping tool names to their details (description, parameters)
         """
-        tools_info = {}
+        return dict(self._tool_meta)
         
-        # Add describe_tools information first
-        tools_info["describe_tools"] = {
-            "description": "Returns detailed information about all available tools, including parameters and docstrings",
-            "parameters": {},
-            "return_type": "Dict[str, Dict[str, Any]]"
-        }
+    def _build_tool_meta(self, tool_name: str, tool_func: Callable) -> Dict[str, Any]:
+        """
+        Inspect a tool's docstring and signature for describe_tools.
         
-        for tool_name, tool_func in self.tool_registry.items():
-            # Skip the describe_tools function itself to avoid recursion in display
-            if tool_name == "describe_tools":
-                continue
-                
-            # Get docstring
-            docstring = inspect.getdoc(tool_func) or "No description available"
+        Args:
+            tool_name: Tool name
+            tool_func: Tool function
             
-            # Get signature information
-            try:
-                sig = inspect.signature(tool_func)
-                parameters = {}
-                
-                for param_name, param in sig.parameters.items():
-                    # Skip 'self' for class methods
-                    if param_name == "self":
-                        continue
-                        
-                    param_info = {
-                        "required": param.default is inspect.Parameter.empty,
-                        "type": str(param.annotation).replace("typing.", "").replace("<class '", "").replace("'>", ""),
-                    }
+        Returns:
+            Dict with the tool's description, parameters and return type
+        """
+        if tool_name == "describe_tools":
+            # Fixed entry for the built-in tool
+            return {
+                "description": "Returns detailed information about all available tools, including parameters and docstrings",
+                "parameters": {},
+                "return_type": "Dict[str, Dict[str, Any]]"
+            }
+            
+        # Get docstring
+        docstring = inspect.getdoc(tool_func) or "No description available"
+        
+        # Get signature information
+        try:
+            sig = inspect.signature(tool_func)
+            parameters = {}
+            
+            for param_name, param in sig.parameters.items():
+                # Skip 'self' for class methods
+                if param_name == "self":
+                    continue
                     
-                    # Add default value if available
-                    if param.default is not inspect.Parameter.empty and param.default is not None:
-                        param_info["default"] = param.default
-                        
-                    parameters[param_name] = param_info
-                
-                # Get return type if annotated
-                return_type = "Any"
-                if sig.return_annotation is not inspect.Signature.empty:
-                    return_type = str(sig.return_annotation).replace("typing.", "").replace("<class '", "").replace("'>", "")
-                
-                # Add tool info to result
-                tools_info[tool_name] = {
-                    "description": docstring,
-                    "parameters": parameters,
-                    "return_type": return_type
-                }
-            except Exception as e:
-                logger.error(f"Error getting details for tool '{tool_name}': {e}")
-                tools_info[tool_name] = {
-                    "description": docstring,
-                    "parameters": {},
-                    "error": str(e)
+                param_info = {
+                    "required": param.default is inspect.Parameter.empty,
+                    "type": str(param.annotation).replace("typing.", "").replace("<class '", "").replace("'>", ""),
                 }
                 
-        return tools_info
+                # Add default value if available
+                if param.default is not inspect.Parameter.empty and param.default is not None:
+                    param_info["default"] = param.default
+                    
+                parameters[param_name] = param_info
+            
+            # Get return type if annotated
+            return_type = "Any"
+            if sig.return_annotation is not inspect.Signature.empty:
+                return_type = str(sig.return_annotation).replace("typing.", "").replace("<class '", "").replace("'>", "")
+            
+            return {
+                "description": docstring,
+                "parameters": parameters,
+                "return_type": return_type
+            }
+        except Exception as e:
+            logger.error(f"Error getting details for tool '{tool_name}': {e}")
+            return {
+                "description": docstring,
+                "parameters": {},
+                "error": str(e)
+            }
 
     async def run_with_tasks(
         self,
@@ -573,7 +1174,10 @@ class BaseMCPServer:
             shutdown_callbacks: A list of callable functions that return awaitables
                                 (coroutines) to execute before shutting down tasks.
             **uvicorn_kwargs: Additional keyword arguments passed directly to
-                              uvicorn.Config.
+                              uvicorn.Config. `http` defaults to "httptools" when
+                              installed and `log_config` to None. The event loop
+                              is the caller's: call install_fast_loop() before
+                              asyncio.run() for uvloop.
         """
         # Determine host and port
         final_host = host or os.environ.get("MCP_HOST") or "0.0.0.0"
@@ -594,7 +1198,7 @@ class BaseMCPServer:
             port=final_port, # Use determined port
             log_level=log_level,
             lifespan="off", # Manage lifecycle manually in this method
-            **uvicorn_kwargs
+            **{"http": uvicorn_http_setting(), "log_config": None, **uvicorn_kwargs}
         )
         server = uvicorn.Server(config)
 
@@ -616,7 +1220,7 @@ class BaseMCPServer:
                             coro = task_item_func()
                             if inspect.isawaitable(coro):
                                 checked_tasks_coroutines.append(coro)
-                                logger.debug(f"Scheduled concurrent task: {getattr(task_item_func, '__name__', repr(task_item_func))}")
+                                logger.debug("Scheduled concurrent task: %s", getattr(task_item_func, '__name__', repr(task_item_func)))
                             else:
                                 logger.warning(f"Callable {getattr(task_item_func, '__name__', repr(task_item_func))} in concurrent_tasks did not return an awaitable, skipping.")
                         except Exception as e:
@@ -643,7 +1247,7 @@ class BaseMCPServer:
             logger.info("run_with_tasks task was cancelled.")
             # Propagate cancellation if needed, or just proceed to finally for cleanup
         except Exception as e:
-            logger.error(f"An unexpected error occurred in run_with_tasks gather: {e}", exc_info=True)
+            logger.error("An unexpected error occurred in run_with_tasks gather: %s", e, exc_info=True)
             # Ensure cleanup happens in finally block
 
         finally:
@@ -651,32 +1255,58 @@ class BaseMCPServer:
 
             # 1. Run shutdown callbacks
             if shutdown_callbacks:
-                logger.info(f"Executing {len(shutdown_callbacks)} shutdown callback(s)...")
-                callback_tasks = []
+                logger.info("Executing %d shutdown callback(s)...", len(shutdown_callbacks))
+                callback_tasks: Dict[asyncio.Future, str] = {} # task -> callback name
+                debug_enabled = logger.isEnabledFor(logging.DEBUG)
                 for callback_func in shutdown_callbacks:
-                    if callable(callback_func):
-                        try:
-                            callback_coro = callback_func()
-                            if inspect.isawaitable(callback_coro):
-                                callback_tasks.append(asyncio.create_task(callback_coro, name=f"shutdown_callback_{getattr(callback_func, '__name__', 'unknown')}"))
-                                logger.debug(f"Scheduled shutdown callback: {getattr(callback_func, '__name__', repr(callback_func))}")
-                            else:
-                                logger.warning(f"Shutdown callback {getattr(callback_func, '__name__', repr(callback_func))} did not return an awaitable, skipping.")
-                        except Exception as cb_e:
-                            logger.error(f"Error calling shutdown callback function {getattr(callback_func, '__name__', repr(callback_func))}: {cb_e}", exc_info=True)
-
-                    else:
-                        logger.warning(f"Shutdown callback {callback_func} is not callable, skipping.")
+                    if not callable(callback_func):
+                        logger.warning("Shutdown callback %s is not callable, skipping.", callback_func)
+                        continue
+                    # Resolved once per callback and reused by every log line and the task name
+                    callback_name = getattr(callback_func, '__name__', None) or repr(callback_func)
+                    try:
+                        callback_coro = callback_func()
+                        if asyncio.iscoroutine(callback_coro):
+                            callback_task = asyncio.create_task(callback_coro, name=f"shutdown_callback_{callback_name}")
+                        elif inspect.isawaitable(callback_coro):
+                            # Futures and other awaitables can't go through create_task()
+                            callback_task = asyncio.ensure_future(callback_coro)
+                        else:
+                            logger.warning("Shutdown callback %s did not return an awaitable, skipping.", callback_name)
+                            continue
+                        callback_tasks[callback_task] = callback_name
+                        if debug_enabled:
+                            logger.debug("Scheduled shutdown callback: %s", callback_name)
+                    except Exception as cb_e:
+                        logger.error("Error calling shutdown callback function %s: %s", callback_name, cb_e, exc_info=True)
 
                 if callback_tasks:
                     try:
-                        results = await asyncio.gather(*callback_tasks, return_exceptions=True)
-                        for i, res in enumerate(results):
-                            if isinstance(res, Exception):
-                                logger.error(f"Shutdown callback {callback_tasks[i].get_name()} failed: {res}", exc_info=res)
-                        logger.info("Shutdown callbacks finished.")
+                        # Report each callback as soon as it finishes instead of after the
+                        # slowest, and stop waiting once shutdown_timeout has elapsed
+                        loop = asyncio.get_running_loop()
+                        deadline = None if self.shutdown_timeout is None else loop.time() + self.shutdown_timeout
+                        pending = set(callback_tasks)
+                        while pending:
+                            remaining = None if deadline is None else deadline - loop.time()
+                            if remaining is not None and remaining <= 0:
+                                break
+                            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                            for task in done:
+                                res = None if task.cancelled() else task.exception()
+                                if isinstance(res, Exception):
+                                    logger.error("Shutdown callback %s failed: %s", callback_tasks[task], res, exc_info=res)
+                        if pending:
+                            logger.error(
+                                "Shutdown callbacks exceeded %ss, cancelling: %s",
+                                self.shutdown_timeout, ", ".join(callback_tasks[task] for task in pending)
+                            )
+                            for task in pending:
+                                task.cancel()
+                        else:
+                            logger.info("Shutdown callbacks finished.")
                     except Exception as e_cb_gather:
-                         logger.error(f"Error gathering shutdown callbacks: {e_cb_gather}", exc_info=True)
+                         logger.error("Error gathering shutdown callbacks: %s", e_cb_gather, exc_info=True)
 
 
             # 2. Cancel all running tasks (server + user tasks)
@@ -692,51 +1322,33 @@ class BaseMCPServer:
                     tasks_to_cancel.append(task)
 
             if tasks_to_cancel:
-                logger.info(f"Cancelling {len(tasks_to_cancel)} running task(s)...")
+                logger.info("Cancelling %d running task(s)...", len(tasks_to_cancel))
                 for task in tasks_to_cancel:
                     task.cancel()
 
-                # Wait for tasks to finish cancellation
-                cancelled_wait_results = await asyncio.gather(*tasks_to_cancel, return_exceptions=True)
-                logger.info("Running tasks cancellation complete.")
+                # Wait for tasks to finish cancellation (bounded, so a task that
+                # swallows cancellation can't hold the process open)
+                done, still_running = await asyncio.wait(tasks_to_cancel, timeout=self.shutdown_timeout)
+                if still_running:
+                    logger.error(
+                        "%d task(s) did not stop within %ss: %s",
+                        len(still_running), self.shutdown_timeout, ", ".join(task.get_name() for task in still_running)
+                    )
+                else:
+                    logger.info("Running tasks cancellation complete.")
 
-                # Log any errors during cancellation (other than CancelledError)
-                for i, result in enumerate(cancelled_wait_results):
-                    task = tasks_to_cancel[i]
-                    task_name = task.get_name() if hasattr(task, 'get_name') else f"task_{i}"
-                    if isinstance(result, Exception) and not isinstance(result, asyncio.CancelledError):
-                        logger.error(f"Error during cancellation of task {task_name}: {result}", exc_info=result)
-                    elif not isinstance(result, asyncio.CancelledError):
-                         logger.debug(f"Task {task_name} finished during cancellation with result: {result}")
+                # Log any errors during cancellation (other than CancelledError); the
+                # common all-cancelled case does no per-task work beyond this check
+                debug_enabled = logger.isEnabledFor(logging.DEBUG)
+                for task in tasks_to_cancel:
+                    if task not in done or task.cancelled():
+                        continue
+                    result = task.exception()
+                    if result is not None:
+                        logger.error("Error during cancellation of task %s: %r", task.get_name(), result, exc_info=result)
+                    elif debug_enabled:
+                        logger.debug("Task %s finished during cancellation with result: %s", task.get_name(), task.result())
 
             logger.info("Shutdown process complete.")
 
-            logger.info(f"Server '{self.server_name}' has shut down.")
-
-    def run(self, host: Optional[str] = None, port: Optional[int] = None, **kwargs):
-        """
-        Run the server using uvicorn.
-
-        Args:
-            host: Host to listen on. If None, checks the MCP_HOST environment
-                  variable, otherwise defaults to "0.0.0.0".
-            port: Port to listen on. If None, checks the MCP_PORT environment
-                  variable, otherwise defaults to 8000.
-            **kwargs: Additional arguments passed to uvicorn.run
-        """
-        # Determine host and port
-        final_host = host or os.environ.get("MCP_HOST") or "0.0.0.0"
-        final_port = 8000 # Default port
-        if port is not None:
-            final_port = port
-        else:
-            env_port_str = os.environ.get("MCP_PORT")
-            if env_port_str:
-                try:
-                    final_port = int(env_port_str)
-                except ValueError:
-                    logger.warning(f"Invalid MCP_PORT environment variable '{env_port_str}'. Using default port {final_port}.")
-
-        # Use determined host/port in log message and uvicorn.run
-        logger.info(f"Starting {self.server_name} on {final_host}:{final_port}")
-        uvicorn.run(self.app, host=final_host, port=final_port, **kwargs) 
\ No newline at end of file
+            logger.info("Server '%s' has shut down.", self.server_name)
@@ -6,8 +6,11 @@ including scheduled notifications and recurring notifications.
 """
 
 import asyncio
+import functools
 import logging
-from datetime import datetime
+import itertools
+import time
+import weakref
 from typing import Dict, List, Optional, Any, Callable, Awaitable
 
 from ..common.constants import (
@@ -20,6 +23,70 @@ from ..common.constants import (
 # Get logger
 logger = logging.getLogger("pymcp_sse.server.notifications")
 
+# Job IDs: monotonic clock (distinguishes runs of the process) plus a counter
+_job_counter = itertools.count(1)
+
+def _new_job_suffix() -> str:
+    """Return a unique suffix for a scheduled/periodic job ID."""
+    return f"{time.monotonic_ns()}_{next(_job_counter)}"
+
+class _PeriodicJob:
+    """
+    Runs a coroutine function at a fixed rate from a chain of loop timers.
+    
+    Fire times are anchored to the start time (start + n * interval), so the
+    time spent sending doesn't accumulate as drift. A tick is skipped while the
+    previous send is still running, and ticks missed while the loop was blocked
+    are dropped rather than fired in a burst.
+    """
+    __slots__ = ("_loop", "_interval", "_send", "_next_time", "_handle", "_task", "_cancelled", "__weakref__")
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, interval: float, send: Callable[[], Awaitable[None]]):
+        self._loop = loop
+        self._interval = interval
+        self._send = send
+        self._next_time = 0.0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+        self._cancelled = False
+        
+    def start(self):
+        """Fire the first tick as soon as possible."""
+        self._next_time = self._loop.time()
+        self._handle = self._loop.call_at(self._next_time, self._tick)
+        
+    def _tick(self):
+        # Reschedule before sending, from the previous fire time rather than now
+        self._next_time += self._interval
+        now = self._loop.time()
+        if self._next_time <= now:
+            missed = (now - self._next_time) // self._interval + 1
+            self._next_time += missed * self._interval
+        self._handle = self._loop.call_at(self._next_time, self._tick)
+        
+        # The job holds its current send task, so no separate reference is needed
+        if self._task is None or self._task.done():
+            self._task = self._loop.create_task(self._send())
+            
+    def cancel(self) -> Optional[asyncio.Task]:
+        """
+        Stop the timer chain and any send in progress.
+        
+        Returns:
+            The send task being cancelled, if one was still running
+        """
+        self._cancelled = True
+        if self._handle is not None:
+            self._handle.cancel()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            return self._task
+        return None
+            
+    def done(self) -> bool:
+        """True once the job has been cancelled."""
+        return self._cancelled
+
 class NotificationScheduler:
     """
     Utility class for scheduling and managing notifications.
@@ -33,8 +100,32 @@ class NotificationScheduler:
             server: An instance of BaseMCPServer
         """
         self.server = server
-        self.scheduled_tasks = {}
-        self.periodic_tasks = {}
+        # Job ID -> timer handle, task or periodic job. Weak values: entries go away
+        # with the object, so finished jobs need no explicit cleanup.
+        self.scheduled_tasks: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+        self.periodic_tasks: "weakref.WeakValueDictionary[str, _PeriodicJob]" = weakref.WeakValueDictionary()
+        # Strong refs for what the loop doesn't keep alive on its own (send tasks,
+        # periodic jobs between ticks); pending timer handles are held by the loop
+        self._running: set = set()
+        
+    def _sender(self, type_name: str, target_session_id: Optional[str]) -> Callable[..., Awaitable[None]]:
+        """
+        Resolve the server call for a notification target once.
+        
+        Args:
+            type_name: Notification type
+            target_session_id: Session ID, or None to broadcast
+            
+        Returns:
+            Coroutine function taking `message` and `data` keyword arguments
+        """
+        if target_session_id:
+            return functools.partial(
+                self.server.push_notification,
+                server_session_id=target_session_id,
+                type_name=type_name
+            )
+        return functools.partial(self.server.broadcast_notification, type_name=type_name)
         
     async def schedule_notification(
         self, 
@@ -57,34 +148,30 @@ class NotificationScheduler:
         Returns:
             task_id: A unique ID for the scheduled task
         """
-        task_id = f"notification_{datetime.now().timestamp()}_{id(message)}"
+        task_id = f"notification_{_new_job_suffix()}"
+        send = self._sender(type_name, target_session_id)
         
-        async def _delayed_notification():
-            await asyncio.sleep(delay_seconds)
+        async def _send_notification():
             try:
-                if target_session_id:
-                    await self.server.push_notification(
-                        server_session_id=target_session_id,
-                        type_name=type_name,
-                        message=message,
-                        data=data
-                    )
-                else:
-                    await self.server.broadcast_notification(
-                        type_name=type_name,
-                        message=message,
-                        data=data
-                    )
-                # Clean up task reference
-                if task_id in self.scheduled_tasks:
-                    del self.scheduled_tasks[task_id]
+                await send(message=message, data=data)
             except Exception as e:
-                logger.error(f"Error in scheduled notification {task_id}: {e}")
+                logger.error("Error in scheduled notification %s: %s", task_id, e)
                 
-        # Create and store the task
-        task = asyncio.create_task(_delayed_notification())
-        self.scheduled_tasks[task_id] = task
-        logger.info(f"Scheduled notification '{message}' (ID: {task_id}) in {delay_seconds}s")
+        def _fire():
+            # The timer handle is replaced by the task sending the notification,
+            # which stays referenced (and cancellable) until it finishes
+            task = asyncio.create_task(_send_notification())
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+            self.scheduled_tasks[task_id] = task
+            
+        if delay_seconds <= 0:
+            # Nothing to wait for: start sending right away, no timer
+            _fire()
+        else:
+            # A timer handle instead of a task sleeping for the delay
+            self.scheduled_tasks[task_id] = asyncio.get_running_loop().call_later(delay_seconds, _fire)
+        logger.info("Scheduled notification '%s' (ID: %s) in %ss", message, task_id, delay_seconds)
         
         return task_id
         
@@ -98,12 +185,11 @@ class NotificationScheduler:
         Returns:
             bool: True if the task was found and cancelled, False otherwise
         """
-        if task_id in self.scheduled_tasks:
-            task = self.scheduled_tasks[task_id]
-            if not task.done():
-                task.cancel()
-            del self.scheduled_tasks[task_id]
-            logger.info(f"Cancelled scheduled notification (ID: {task_id})")
+        job = self.scheduled_tasks.pop(task_id, None)
+        if job is not None:
+            # Timer handle (not yet due) or task (sending); cancel() is a no-op once done
+            job.cancel()
+            logger.info("Cancelled scheduled notification (ID: %s)", task_id)
             return True
         return False
         
@@ -127,55 +213,58 @@ class NotificationScheduler:
             
         Returns:
             task_id: A unique ID for the periodic task
+            
+        Raises:
+            ValueError: If interval_seconds is not positive
         """
-        task_id = f"periodic_{datetime.now().timestamp()}_{id(message_or_callable)}"
-        
-        async def _periodic_notification():
-            while True:
-                try:
-                    # Determine message and data values
-                    if callable(message_or_callable):
-                        message = message_or_callable()
-                        # Handle async functions
-                        if asyncio.iscoroutine(message):
-                            message = await message
-                    else:
-                        message = message_or_callable
-                        
-                    if callable(data_or_callable):
-                        data = data_or_callable()
-                        # Handle async functions
-                        if asyncio.iscoroutine(data):
-                            data = await data
-                    else:
-                        data = data_or_callable
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+            
+        task_id = f"periodic_{_new_job_suffix()}"
+        
+        # Bound once as closure variables; the job may tick every few ms
+        send = self._sender(type_name, target_session_id)
+        iscoroutine = asyncio.iscoroutine
+        # Classify the arguments once: static value, async function or other callable
+        message_is_async = asyncio.iscoroutinefunction(message_or_callable)
+        message_is_callable = callable(message_or_callable)
+        data_is_async = asyncio.iscoroutinefunction(data_or_callable)
+        data_is_callable = callable(data_or_callable)
+        
+        async def _send_periodic():
+            try:
+                # Determine message and data values
+                if message_is_async:
+                    message = await message_or_callable()
+                elif message_is_callable:
+                    message = message_or_callable()
+                    # Handle callables returning a coroutine
+                    if iscoroutine(message):
+                        message = await message
+                else:
+                    message = message_or_callable
                     
-                    # Send the notification
-                    if target_session_id:
-                        await self.server.push_notification(
-                            server_session_id=target_session_id,
-                            type_name=type_name,
-                            message=message,
-                            data=data
-                        )
-                    else:
-                        await self.server.broadcast_notification(
-                            type_name=type_name,
-                            message=message,
-                            data=data
-                        )
-                except asyncio.CancelledError:
-                    logger.info(f"Periodic notification task {task_id} cancelled")
-                    break
-                except Exception as e:
-                    logger.error(f"Error in periodic notification {task_id}: {e}")
+                if data_is_async:
+                    data = await data_or_callable()
+                elif data_is_callable:
+                    data = data_or_callable()
+                    # Handle callables returning a coroutine
+                    if iscoroutine(data):
+                        data = await data
+                else:
+                    data = data_or_callable
                 
-                await asyncio.sleep(interval_seconds)
+                # Send the notification
+                await send(message=message, data=data)
+            except Exception as e:
+                logger.error("Error in periodic notification %s: %s", task_id, e)
         
-        # Create and store the task
-        task = asyncio.create_task(_periodic_notification())
-        self.periodic_tasks[task_id] = task
-        logger.info(f"Started periodic notification (ID: {task_id}) with {interval_seconds}s interval")
+        # Create and store the job (first notification goes out right away)
+        job = _PeriodicJob(asyncio.get_running_loop(), interval_seconds, _send_periodic)
+        self.periodic_tasks[task_id] = job
+        self._running.add(job)
+        job.start()
+        logger.info("Started periodic notification (ID: %s) with %ss interval", task_id, interval_seconds)
         
         return task_id
         
@@ -189,25 +278,37 @@ class NotificationScheduler:
         Returns:
             bool: True if the task was found and stopped, False otherwise
         """
-        if task_id in self.periodic_tasks:
-            task = self.periodic_tasks[task_id]
-            if not task.done():
-                task.cancel()
-            del self.periodic_tasks[task_id]
-            logger.info(f"Stopped periodic notification (ID: {task_id})")
+        job = self.periodic_tasks.pop(task_id, None)
+        if job is not None:
+            job.cancel()
+            self._running.discard(job)
+            logger.info("Stopped periodic notification (ID: %s)", task_id)
             return True
         return False
         
-    def stop_all_notifications(self):
-        """Stop all scheduled and periodic notifications."""
-        # Stop scheduled notifications
-        for task_id in list(self.scheduled_tasks.keys()):
-            self.cancel_scheduled_notification(task_id)
-            
-        # Stop periodic notifications
-        for task_id in list(self.periodic_tasks.keys()):
-            self.stop_periodic_notification(task_id)
-            
+    async def stop_all_notifications(self):
+        """
+        Stop all scheduled and periodic notifications.
+        
+        Everything is cancelled in one pass, then notifications that were being
+        sent are awaited until their cancellation completes.
+        """
+        in_flight = []
+        for job in list(self.scheduled_tasks.values()):
+            job.cancel()
+            if isinstance(job, asyncio.Task):
+                in_flight.append(job)
+        for job in list(self.periodic_tasks.values()):
+            task = job.cancel()
+            if task is not None:
+                in_flight.append(task)
+                
+        self.scheduled_tasks.clear()
+        self.periodic_tasks.clear()
+        self._running.clear()
+        
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
         logger.info("Stopped all notifications")
 
 # Export the class and constants
@@ -3,5 +3,6 @@ Utility functions for PyMCP
 """
 
 from .log_setup import configure_logging, get_logger
+from .event_loop import install_fast_loop
 
-__all__ = ["configure_logging", "get_logger"]
+__all__ = ["configure_logging", "get_logger", "install_fast_loop"]
@@ -0,0 +1,62 @@
+"""
+Event loop utilities for PyMCP.
+
+This module provides a helper for opting into a faster asyncio event loop
+implementation when one is installed.
+"""
+import asyncio
+import importlib.util
+from typing import Optional
+
+from .log_setup import get_logger
+
+logger = get_logger("utils.event_loop")
+
+def install_fast_loop() -> Optional[str]:
+    """
+    Install the fastest available event loop policy.
+    
+    Tries uringcore (io_uring based, Linux 5.11+) first and falls back to
+    uvloop. Must be called before asyncio.run() so the new policy is used to
+    create the loop. If neither package is installed the default asyncio loop
+    is left in place.
+    
+    Returns:
+        Name of the installed loop implementation, or None if the default loop is kept
+    """
+    try:
+        import uringcore
+        asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+        logger.info("Using uringcore event loop")
+        return "uringcore"
+    except (ImportError, AttributeError):
+        pass
+        
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+        return "uvloop"
+    except ImportError:
+        pass
+        
+    logger.debug("No fast event loop available, using the default asyncio loop")
+    return None
+
+def uvicorn_loop_setting() -> str:
+    """
+    Pick the `loop` setting for uvicorn.
+    
+    Returns:
+        "uvloop" if uvloop is installed, otherwise "auto" (uvicorn's default)
+    """
+    return "uvloop" if importlib.util.find_spec("uvloop") is not None else "auto"
+
+def uvicorn_http_setting() -> str:
+    """
+    Pick the `http` protocol setting for uvicorn.
+    
+    Returns:
+        "httptools" if httptools is installed, otherwise "auto" (uvicorn's default)
+    """
+    return "httptools" if importlib.util.find_spec("httptools") is not None else "auto"
@@ -3,9 +3,14 @@ Logging utilities for PyMCP.
 
 This module provides consistent, configurable logging across the PyMCP package.
 """
+import atexit
+import functools
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
 from typing import Optional, Dict, Union, Any
 
 # Define standard log levels with descriptions
@@ -20,6 +25,14 @@ LOG_LEVELS = {
 # Default log format
 DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
+# Set once logging has been configured (explicitly or by the first get_logger()
+# call), so later get_logger() calls at import time skip the handler checks
+_configured = False
+_configure_lock = threading.Lock()
+
+# Background writer for the log file (see configure_logging)
+_file_listener: Optional[logging.handlers.QueueListener] = None
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger with the given name, configured according to environment variables.
@@ -41,12 +54,36 @@ def get_logger(name: str) -> logging.Logger:
     
     logger = logging.getLogger(name)
     
-    # Only configure if not already configured
-    if not logger.handlers and not logging.getLogger().handlers:
-        configure_logging()
+    # Only configure if nothing (us or the application) has configured logging yet
+    if not _configured:
+        with _configure_lock:
+            if not _configured and not logger.handlers and not logging.getLogger().handlers:
+                configure_logging()
+            _mark_configured()
         
     return logger
 
+def _mark_configured() -> None:
+    """Record that get_logger() no longer needs to check the logging setup."""
+    global _configured
+    _configured = True
+
+def _stop_file_listener() -> None:
+    """Flush and close the background log file writer, if any."""
+    global _file_listener
+    listener, _file_listener = _file_listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+atexit.register(_stop_file_listener)
+
+@functools.lru_cache(maxsize=8)
+def _formatter(format_str: str) -> logging.Formatter:
+    """Return the (cached) formatter for a format string."""
+    return logging.Formatter(format_str)
+
 def configure_logging(
     level: Optional[Union[str, int]] = None,
     format_str: Optional[str] = None,
@@ -59,9 +96,12 @@ def configure_logging(
     Args:
         level: Log level (name or value)
         format_str: Log format string
-        log_file: File to log to
+        log_file: File to log to; records are written by a background thread
+                  so disk I/O doesn't block the event loop
         handlers: Custom handlers to add
     """
+    global _file_listener
+    
     # Get level from environment or parameter
     if level is None:
         level = os.environ.get('PYMCP_LOG_LEVEL', 'INFO')
@@ -82,12 +122,12 @@ def configure_logging(
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
     
-    # Remove any existing handlers
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+    # Remove any existing handlers (flushing a previous log file writer)
+    root_logger.handlers.clear()
+    _stop_file_listener()
     
-    # Create formatter
-    formatter = logging.Formatter(format_str)
+    # Get formatter (shared across calls with the same format)
+    formatter = _formatter(format_str)
     
     # Add console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -99,7 +139,11 @@ def configure_logging(
         try:
             file_handler = logging.FileHandler(log_file)
             file_handler.setFormatter(formatter)
-            root_logger.addHandler(file_handler)
+            # Loggers only enqueue the record; the listener thread writes the file
+            log_queue = queue.SimpleQueue()
+            _file_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+            _file_listener.start()
+            root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
         except Exception as e:
             # Don't fail if logging to file fails
             logging.getLogger('pymcp.utils.logging').error(f"Failed to set up log file {log_file}: {e}")
@@ -114,4 +158,6 @@ def configure_logging(
     # Set library dependency loggers to WARNING level unless explicitly configured
     for logger_name in ['uvicorn', 'httpx', 'fastapi']:
         if not os.environ.get(f'PYMCP_LOG_LEVEL_{logger_name.upper()}'):
-            logging.getLogger(logger_name).setLevel(logging.WARNING) 
\ No newline at end of file
+            logging.getLogger(logger_name).setLevel(logging.WARNING)
+            
+    _mark_configured() 
\ No newline at end of file